@@ -0,0 +1,40 @@
+"""Times LeafNode.to_html with escaping against the same nodes rendered
+without it, for text with and without characters to escape. Plain text
+should cost close to nothing over not escaping at all.
+
+    python3 bench/bench_escape.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import htmlnode
+import leafnode
+from escape import escape_attribute, escape_text
+
+PLAIN = "In the vast and intricate weave of the legendarium there exists a curious anomaly"
+SPECIAL = "if a < b && c > d: print(\"<Tom & Bombadil>\")"
+NODES = 10000
+
+
+def nodes(text):
+    return [leafnode.LeafNode('a', text, {'href': f"/blog/{n}?q={text[:12]}"}) for n in range(NODES)]
+
+def time_per_node(leaves):
+    seconds = min(timeit.repeat(lambda: [leaf.to_html() for leaf in leaves], number=1, repeat=7))
+    return seconds * 1e9 / NODES
+
+def main():
+    print(f"{'text':>8} {'raw ns':>8} {'escaped ns':>11} {'overhead ns':>12}")
+    for name, text in (('plain', PLAIN), ('special', SPECIAL)):
+        leaves = nodes(text)
+        leafnode.escape_text = htmlnode.escape_attribute = lambda value: value
+        raw = time_per_node(leaves)
+        leafnode.escape_text, htmlnode.escape_attribute = escape_text, escape_attribute
+        escaped = time_per_node(leaves)
+        print(f"{name:>8} {raw:>8.0f} {escaped:>11.0f} {escaped - raw:>12.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""Times split_nodes_link/split_nodes_image against the number of links
+in one paragraph. Time per link should stay flat as the count grows.
+
+    python3 bench/bench_links.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from textnode import TextNode, TextType
+from utils.utils import split_nodes_image, split_nodes_link
+
+
+def paragraph(links):
+    return ' '.join(f"see [link {n}](https://example.com/{n}) and ![img {n}](/images/{n}.png)" for n in range(links))
+
+def main():
+    print(f"{'links':>8} {'total ms':>10} {'us/link':>10}")
+    for links in (100, 1000, 10000, 50000):
+        nodes = [TextNode(paragraph(links), TextType.TEXT)]
+        runs = max(1, 20000 // links)
+        seconds = timeit.timeit(lambda: split_nodes_link(split_nodes_image(nodes)), number=runs) / runs
+        print(f"{links:>8} {seconds * 1000:>10.2f} {seconds * 1e6 / links:>10.2f}")
+
+if __name__ == '__main__':
+    main()
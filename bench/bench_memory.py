@@ -0,0 +1,58 @@
+"""Reports bytes per node and peak memory for rendering a large synthetic
+document, to size build workers.
+
+    python3 bench/bench_memory.py [paragraphs]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.utils import markdown_to_html_node
+
+
+def synthetic_markdown(paragraphs):
+    blocks = []
+    for n in range(paragraphs):
+        blocks.append(f"## Section {n}")
+        blocks.append(f"Some **bold** and _italic_ text with `code`, a [link](/page/{n % 50}) and ![an image](/images/{n % 10}.png).")
+        blocks.append("- first item\n- second [item](/item)\n- third item")
+        blocks.append("> a quote\n> over two lines")
+    return "\n\n".join(blocks)
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children)
+    return count
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    markdown = synthetic_markdown(paragraphs)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tree = markdown_to_html_node(markdown)
+    after = tracemalloc.take_snapshot()
+    tree_bytes = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    nodes = count_nodes(tree)
+
+    tracemalloc.reset_peak()
+    html = tree.to_html()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"markdown size:   {len(markdown):>12,} chars")
+    print(f"html nodes:      {nodes:>12,}")
+    print(f"tree size:       {tree_bytes:>12,} bytes")
+    print(f"bytes per node:  {tree_bytes / nodes:>12.1f}")
+    print(f"html size:       {len(html):>12,} chars")
+    print(f"peak memory:     {peak:>12,} bytes")
+
+if __name__ == '__main__':
+    main()
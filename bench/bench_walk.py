@@ -0,0 +1,53 @@
+"""Times walking a large content tree and reports peak memory, for the
+lazy walker against collecting every page up front. Time to the first page
+and peak memory should stay flat as the tree grows.
+
+    python3 bench/bench_walk.py [pages]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.walk import iter_pages
+
+PAGES_PER_DIR = 100
+
+
+def write_tree(root, pages):
+    for n in range(pages):
+        directory = os.path.join(root, f"section{n // PAGES_PER_DIR:05}")
+        if n % PAGES_PER_DIR == 0:
+            os.makedirs(directory)
+            with open(os.path.join(directory, 'cover.png'), 'w'):
+                pass
+        with open(os.path.join(directory, f"page{n:06}.md"), 'w') as file:
+            file.write(f"# Page {n}\n")
+
+def measure(function):
+    tracemalloc.start()
+    started = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as root:
+        write_tree(root, pages)
+        first = measure(lambda: next(iter_pages(root, 'docs')))
+        streamed = measure(lambda: sum(1 for _ in iter_pages(root, 'docs')))
+        collected = measure(lambda: list(iter_pages(root, 'docs')))
+
+    print(f"{pages} pages in directories of {PAGES_PER_DIR}")
+    print(f"{'':>12} {'ms':>10} {'peak KiB':>10}")
+    for name, (ms, kib) in (('first page', first), ('streamed', streamed), ('collected', collected)):
+        print(f"{name:>12} {ms:>10.1f} {kib:>10.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Synthetic content trees for the benchmarks.
+
+Pages are generated from a seeded random source, so the same arguments
+always produce the same corpus.
+"""
+import os
+import random
+import shutil
+
+WORDS = ('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'elf', 'hobbit', 'ring', 'shire', 'river',
+         'mountain', 'forest', 'road', 'tower', 'song', 'tale', 'light', 'shadow', 'king', 'wizard')
+
+DEFAULT_BLOCK_MIX = {
+    'paragraph': 5,
+    'heading': 2,
+    'unordered_list': 1,
+    'ordered_list': 1,
+    'quote': 1,
+    'code': 1,
+}
+
+INLINE_KINDS = ('bold', 'italic', 'code', 'link', 'image')
+
+
+def words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+def inline_text(rng, word_count, density):
+    """Text of word_count words where each word has a density chance of
+    being replaced by bold, italic, code, a link or an image."""
+    parts = []
+    for _ in range(word_count):
+        if rng.random() >= density:
+            parts.append(rng.choice(WORDS))
+            continue
+        kind = rng.choice(INLINE_KINDS)
+        text = words(rng, rng.randint(1, 3))
+        if kind == 'bold':
+            parts.append(f"**{text}**")
+        elif kind == 'italic':
+            parts.append(f"_{text}_")
+        elif kind == 'code':
+            parts.append(f"`{text}`")
+        elif kind == 'link':
+            parts.append(f"[{text}](/blog/{rng.choice(WORDS)})")
+        else:
+            parts.append(f"![{text}](/images/{rng.choice(WORDS)}.png)")
+    return ' '.join(parts)
+
+def synthetic_block(rng, kind, density):
+    if kind == 'heading':
+        return f"{'#' * rng.randint(2, 4)} {words(rng, 4)}"
+    if kind == 'unordered_list':
+        return '\n'.join(f"- {inline_text(rng, 8, density)}" for _ in range(rng.randint(2, 6)))
+    if kind == 'ordered_list':
+        return '\n'.join(f"{n + 1}. {inline_text(rng, 8, density)}" for n in range(rng.randint(2, 6)))
+    if kind == 'quote':
+        return '\n'.join(f"> {inline_text(rng, 10, density)}" for _ in range(rng.randint(1, 4)))
+    if kind == 'code':
+        return "```\n" + '\n'.join(words(rng, 6) for _ in range(rng.randint(2, 8))) + "\n```"
+    return '\n'.join(inline_text(rng, 15, density) for _ in range(rng.randint(1, 4)))
+
+def synthetic_page(rng, blocks=40, block_mix=None, density=0.1):
+    mix = block_mix or DEFAULT_BLOCK_MIX
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=blocks)
+    body = [synthetic_block(rng, kind, density) for kind in kinds]
+    return '\n\n'.join([f"# {words(rng, 3).title()}"] + body) + '\n'
+
+def write_corpus(root, pages=100, blocks=40, block_mix=None, density=0.1, static_files=20, seed=0):
+    """Writes content/, static/ and template.html under root, laid out like
+    the repository, and returns the list of markdown paths."""
+    rng = random.Random(seed)
+    repo = os.path.join(os.path.dirname(__file__), '..')
+
+    shutil.copy(os.path.join(repo, 'template.html'), os.path.join(root, 'template.html'))
+
+    paths = []
+    for n in range(pages):
+        path = os.path.join(root, 'content', 'blog', f'post{n // 100}', f'page{n}', 'index.md')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(synthetic_page(rng, blocks, block_mix, density))
+        paths.append(path)
+
+    static_dir = os.path.join(root, 'static', 'images')
+    os.makedirs(static_dir, exist_ok=True)
+    for n in range(static_files):
+        with open(os.path.join(static_dir, f'image{n}.png'), 'wb') as file:
+            file.write(rng.randbytes(64 * 1024))
+
+    return paths
@@ -0,0 +1,114 @@
+"""Times every stage of the pipeline on a synthetic corpus and prints the
+results as JSON, so runs can be compared over time.
+
+    python3 bench/run_benchmarks.py --pages 200 --density 0.2 --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from corpus import write_corpus
+from utils import utils
+from utils.utils import (block_to_block_type, generate_page, markdown_to_blocks, markdown_to_html_node,
+                         publish_static_files, text_to_textnodes)
+
+
+def measure(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return {'runs': repeat, 'best_s': min(times), 'mean_s': statistics.mean(times)}
+
+def run_stages(root, markdowns, repeat):
+    blocks = [block for markdown in markdowns for block in markdown_to_blocks(markdown)]
+    paragraphs = [block for block in blocks if block[0] not in '#`']
+    trees = [markdown_to_html_node(markdown) for markdown in markdowns]
+    sources = sorted(os.path.join(dirpath, name)
+                     for dirpath, _, names in os.walk(os.path.join(root, 'content')) for name in names)
+
+    def generate_pages():
+        # Measure cold renders; the block cache would otherwise serve repeats.
+        utils.block_cache.clear()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for n, source in enumerate(sources):
+                generate_page(source, os.path.join(root, 'template.html'), os.path.join(root, 'out', f'{n}.html'))
+
+    def publish():
+        with contextlib.redirect_stdout(io.StringIO()):
+            publish_static_files()
+
+    stages = {
+        'markdown_to_blocks': lambda: [markdown_to_blocks(markdown) for markdown in markdowns],
+        'block_to_block_type': lambda: [block_to_block_type(block) for block in blocks],
+        'text_to_textnodes': lambda: [text_to_textnodes(block) for block in paragraphs],
+        'markdown_to_html_node': lambda: [markdown_to_html_node(markdown) for markdown in markdowns],
+        'to_html': lambda: [tree.to_html() for tree in trees],
+        'generate_page': generate_pages,
+        'publish_static_files': publish,
+    }
+
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        for name, function in stages.items():
+            results[name] = measure(function, repeat)
+    finally:
+        os.chdir(cwd)
+
+    results['end_to_end_main'] = measure(
+        lambda: subprocess.run([sys.executable, os.path.join(SRC, 'main.py')], cwd=root,
+                               check=True, stdout=subprocess.DEVNULL),
+        repeat,
+    )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--blocks', type=int, default=40, help='blocks per page')
+    parser.add_argument('--density', type=float, default=0.1, help='chance of an inline construct per word')
+    parser.add_argument('--mix', type=json.loads, default=None,
+                        help='block mix as JSON weights, e.g. \'{"paragraph": 3, "code": 1}\'')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        paths = write_corpus(root, args.pages, args.blocks, args.mix, args.density, seed=args.seed)
+        markdowns = []
+        for path in paths:
+            with open(path) as file:
+                markdowns.append(file.read())
+
+        report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'params': {key: value for key, value in vars(args).items() if key != 'output'},
+            'corpus_bytes': sum(len(markdown) for markdown in markdowns),
+            'results': run_stages(root, markdowns, args.repeat),
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    main()
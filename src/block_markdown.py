@@ -1,5 +1,6 @@
 
 from enum import Enum
+import re
 
 from htmlnode import HtmlNode
 
@@ -9,4 +10,130 @@ class BlockType(Enum):
     CODE = "code"
     QUOTE = "quote"
     UNORDERED_LIST = "unordered_list"
-    ORDERED_LIST = "ordered_list"
\ No newline at end of file
+    ORDERED_LIST = "ordered_list"
+
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+FENCE = "```"
+
+def strip_ordered_prefix(line: str):
+    if len(line) >= 3 and line[0].isdecimal() and line[1:3] == '. ':
+        return line[3:]
+    return line
+
+def block_payload(block_type: BlockType, lines: list[str]):
+    """Extracts what the renderer needs from the block lines for a type:
+    the text for paragraphs, code and quotes, (prefix, text) for headings
+    and the stripped items for lists."""
+    match(block_type):
+        case BlockType.HEADING:
+            block = '\n'.join(lines)
+            prefix = HEADING_PATTERN.match(block).group(0)
+            return prefix, block.replace(prefix, '')
+        case BlockType.CODE:
+            return '\n'.join(lines).strip('`')
+        case BlockType.QUOTE:
+            return '\n'.join(line[1:] if line.startswith('>') else line for line in lines).strip(' ')
+        case BlockType.UNORDERED_LIST:
+            return [(line[2:] if line.startswith('- ') else line).strip(' ') for line in lines]
+        case BlockType.ORDERED_LIST:
+            return [strip_ordered_prefix(line).strip(' ') for line in lines]
+        case _:
+            return '\n'.join(lines)
+
+def classify_block(lines: list[str]):
+    """Returns (BlockType, payload) looking at each line once.
+
+    Quote and list payloads are collected while the lines are checked, so
+    the renderer never scans the block again.
+    """
+    first = lines[0]
+    if HEADING_PATTERN.match(first):
+        return BlockType.HEADING, block_payload(BlockType.HEADING, lines)
+    if first.startswith(FENCE) and lines[-1].endswith(FENCE):
+        return BlockType.CODE, block_payload(BlockType.CODE, lines)
+
+    quote, unordered, ordered = [], [], []
+    for n, line in enumerate(lines):
+        if quote is not None:
+            if line.startswith('>'):
+                quote.append(line[1:])
+            else:
+                quote = None
+        if unordered is not None:
+            if line.startswith('- '):
+                unordered.append(line[2:].strip(' '))
+            else:
+                unordered = None
+        if ordered is not None:
+            if line.startswith(f'{n+1}. '):
+                # Like the old ^\d\. substitution, only one-digit markers are removed.
+                ordered.append((line[3:] if n < 9 else line).strip(' '))
+            else:
+                ordered = None
+        if quote is None and unordered is None and ordered is None:
+            return BlockType.PARAGRAPH, '\n'.join(lines)
+
+    if quote is not None:
+        return BlockType.QUOTE, '\n'.join(quote).strip(' ')
+    if unordered is not None:
+        return BlockType.UNORDERED_LIST, unordered
+    return BlockType.ORDERED_LIST, ordered
+
+def finish_block(lines: list[str]):
+    lines[0] = lines[0].lstrip()
+    lines[-1] = lines[-1].rstrip()
+    return lines
+
+def iter_markdown_blocks(lines):
+    """Yields (BlockType, block) pairs from an iterable of lines."""
+    for block_type, block, _ in iter_classified_blocks(lines):
+        yield block_type, block
+
+def iter_classified_blocks(lines):
+    """Yields (BlockType, block, payload) triples from an iterable of lines."""
+    for block_lines in iter_block_lines(lines):
+        block_type, payload = classify_block(block_lines)
+        yield block_type, '\n'.join(block_lines), payload
+
+def iter_block_lines(lines):
+    """Yields the lines of each block from an iterable of lines, without
+    classifying them.
+
+    Blocks are separated by blank lines, except inside a fenced code block,
+    which runs until its closing fence. Only the current block is held in
+    memory, so lines can come straight from an open file.
+    """
+    block = []
+    in_fence = False
+
+    for line in lines:
+        line = line.rstrip('\n')
+
+        if in_fence:
+            block.append(line)
+            if line.rstrip().endswith(FENCE):
+                in_fence = False
+                yield finish_block(block)
+                block = []
+            continue
+
+        if not line.strip():
+            if block:
+                yield finish_block(block)
+                block = []
+            continue
+
+        if not block and line.lstrip().startswith(FENCE):
+            opener = line.strip()
+            block.append(line)
+            if len(opener) < 2 * len(FENCE) or not opener.endswith(FENCE):
+                in_fence = True
+                continue
+            yield finish_block(block)
+            block = []
+            continue
+
+        block.append(line)
+
+    if block:
+        yield finish_block(block)
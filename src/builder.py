@@ -0,0 +1,153 @@
+from contextlib import contextmanager
+import os
+import threading
+
+from template import TemplateCache
+from utils import utils
+from utils.assets import ASSETS_STATE_PATH, fingerprint_assets, load_asset_mapping, rewrite_pages
+from utils.block_cache import BlockCache
+from utils.front_matter import MetadataCache
+from utils.manifest import MANIFEST_PATH, STATE_DIR, BuildManifest
+from utils.output import OutputWriter
+from utils.sync import SYNC_STATE_PATH
+from utils.utils import generate_pages, generate_pages_recursive, publish_static_files, render_page
+from utils.walk import iter_pages
+from utils.watch import page_dest_path
+
+# Held while a builder's settings are installed in the utils module,
+# which every builder in the process shares.
+_ACTIVE_LOCK = threading.RLock()
+
+class Builder():
+    """Builds a site from a long-lived object, so a service can render
+    pages on request without paying for process startup or cold caches.
+
+    The builder keeps its configuration, compiled templates and rendered
+    blocks between calls. The render functions read their caches from the
+    utils module, so each call installs this builder's caches there and
+    restores the previous ones afterwards. Since every builder in the
+    process shares that module, calls are serialized across all builders:
+    a call from another thread waits until the current one returns.
+
+    The manifest, static file list and other state kept between builds
+    live in state_dir, so builders with their own state_dir do not
+    overwrite each other's state.
+    """
+
+    def __init__(self, content_dir='content', template_path='template.html', static_dir='static', dest_dir='docs',
+                 basepath='/', jobs=1, pipeline=False, incremental=False, minify=False, block_cache_size=4096,
+                 include=(), exclude=(), drafts=False, render_cache=None, state_dir=STATE_DIR):
+        self.content_dir = content_dir
+        self.template_path = template_path
+        self.static_dir = static_dir
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.jobs = jobs
+        self.pipeline = pipeline
+        self.incremental = incremental
+        self.minify = minify
+        # Globs on '/' separated paths relative to content_dir.
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+        self.drafts = drafts
+        self.state_dir = state_dir
+        self.template_cache = TemplateCache()
+        self.block_cache = BlockCache(block_cache_size)
+        self.metadata = MetadataCache()
+        # A RenderCache shared with other builds, or None.
+        self.render_cache = render_cache
+        self.manifest = None
+        self.output = OutputWriter()
+
+    @contextmanager
+    def active(self):
+        """Installs this builder's caches and settings in the utils module
+        for the duration of the block, holding a lock shared by all
+        builders."""
+        with _ACTIVE_LOCK:
+            previous = (utils.template_cache, utils.block_cache, utils.metadata_cache, utils.render_cache,
+                        utils.output_writer, utils.minify)
+            utils.template_cache, utils.block_cache, utils.metadata_cache = self.template_cache, self.block_cache, self.metadata
+            utils.render_cache, utils.output_writer, utils.minify = self.render_cache, self.output, self.minify
+            try:
+                yield self
+            finally:
+                (utils.template_cache, utils.block_cache, utils.metadata_cache, utils.render_cache,
+                 utils.output_writer, utils.minify) = previous
+
+    def build(self):
+        """Copies static files and renders every page, leaving out drafts
+        unless drafts is set. Returns the pages that failed as
+        (from_path, error) pairs.
+
+        Incremental builders skip pages whose inputs are unchanged and
+        remove outputs whose source is gone; self.manifest holds the
+        counts of the last build. Other builds discard the manifest. self.output counts the pages written
+        and the ones left untouched because their html did not change.
+        """
+        manifest_path = self.state_path(MANIFEST_PATH)
+        if self.incremental:
+            self.manifest = BuildManifest(manifest_path)
+        else:
+            # A full build may render outputs differently from what the
+            # manifest recorded, so the next incremental build starts over.
+            self.manifest = None
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+        self.output = OutputWriter()
+        with self.active():
+            if utils.profiler is not None:
+                with utils.profiler.stage('static'):
+                    self.publish_static()
+            else:
+                self.publish_static()
+
+            errors = generate_pages_recursive(self.content_dir, self.template_path, self.dest_dir, self.basepath,
+                                              self.manifest, self.jobs, self.pipeline, self.include, self.exclude,
+                                              self.drafts)
+
+        if self.manifest is not None:
+            for removed in self.manifest.remove_stale():
+                print(f"Removed stale page {removed}")
+            self.manifest.save()
+
+        return errors
+
+    def publish_static(self):
+        publish_static_files(self.static_dir, self.dest_dir, sync=self.incremental, jobs=max(self.jobs, 4),
+                             state_path=self.state_path(SYNC_STATE_PATH))
+
+    def fingerprint(self):
+        """Copies static assets to content-hashed names and points every
+        page at them, including pages an incremental build skipped, which
+        still reference the hashed names of the last run. Returns the
+        {original: hashed} mapping and the pages rewritten."""
+        state_path = self.state_path(ASSETS_STATE_PATH)
+        previous = load_asset_mapping(state_path)
+        mapping = fingerprint_assets(self.static_dir, self.dest_dir, state_path)
+        return mapping, rewrite_pages(self.dest_dir, mapping, self.basepath, previous)
+
+    def state_path(self, default_path):
+        """The path of a state file, e.g. MANIFEST_PATH, in state_dir."""
+        return os.path.join(self.state_dir, os.path.basename(default_path))
+
+    def build_paths(self, paths):
+        """Renders only the given markdown sources under content_dir to
+        their usual outputs. Returns the pages that failed."""
+        self.output = OutputWriter()
+        pages = [(path, page_dest_path(path, self.content_dir, self.dest_dir)) for path in paths]
+        with self.active():
+            return generate_pages(pages, self.template_path, self.basepath, self.jobs, self.pipeline)
+
+    def pages_meta(self):
+        """Yields (from_path, dest_path, PageMeta) for every page, drafts
+        included, reading only the front matter of pages that changed."""
+        for from_path, dest_path in iter_pages(self.content_dir, self.dest_dir, self.include, self.exclude):
+            yield from_path, dest_path, self.metadata.get(from_path)
+
+    def render_string(self, markdown):
+        """Renders markdown to a full page with the site template, without
+        touching the filesystem beyond reading the template."""
+        with self.active():
+            template = self.template_cache.get(self.template_path, self.basepath, self.minify)
+            return render_page(markdown, template, self.basepath)
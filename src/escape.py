@@ -0,0 +1,27 @@
+class Markup(str):
+    """Text that is already HTML and must not be escaped again."""
+    __slots__ = ()
+
+
+def escape_text(text):
+    """Escapes &, < and > for element content. Most text has none of them,
+    so it is checked first and returned as is."""
+    if type(text) is not str:
+        if type(text) is Markup:
+            return text
+        text = '' if text is None else str(text)
+    if '&' not in text and '<' not in text and '>' not in text:
+        return text
+    # Chained replaces beat str.translate here: translate goes character
+    # by character once the table maps to multi-character strings.
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def escape_attribute(value):
+    """Escapes &, <, > and " for a double quoted attribute value."""
+    if type(value) is not str:
+        if type(value) is Markup:
+            return value
+        value = '' if value is None else str(value)
+    if '&' not in value and '<' not in value and '>' not in value and '"' not in value:
+        return value
+    return value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
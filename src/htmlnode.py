@@ -1,33 +1,45 @@
+import sys
+
+from escape import escape_attribute, escape_text
 from textnode import TextNode, TextType
 
 
 class HtmlNode():
+    __slots__ = ('tag', 'value', 'children', 'props')
+
     def __init__(self, tag=None, value=None, children=None, props=None):
-        self.tag = tag
+        self.tag = sys.intern(tag) if type(tag) is str else tag
         self.value = value
         self.children = children
         self.props = props
 
     def to_html(self):
+        return ''.join(self.iter_html())
+
+    def iter_html(self):
         if self.tag == None and self.value:
-            return self.value
+            yield escape_text(self.value)
+            return
         props = self.props_to_html()
 
         if self.value == None and self.children:
-            children_html = ''
+            yield f"<{self.tag}{' '+props if props else ''}>"
             for child in self.children:
-                children_html += child.to_html()
-                
-            return f"<{self.tag}{' '+props if props else ''}>{children_html}</{self.tag}>"
+                yield from child.iter_html()
+            yield f"</{self.tag}>"
+            return
+
+        yield f"<{self.tag}{' '+props if props else ''}>{escape_text(self.value)}</{self.tag}>"
 
-        return f"<{self.tag}{' '+props if props else ''}>{self.value}</{self.tag}>"
+    def write_html(self, file):
+        file.writelines(self.iter_html())
     
     def props_to_html(self):
         if self.props is None:
             return ""
         html=""
         for key, value in self.props.items():
-            html += f' {key}="{value}"'
+            html += f' {key}="{escape_attribute(value)}"'
         return html
 
     def __eq__(self, value):
@@ -1,7 +1,10 @@
+from escape import escape_text
 from htmlnode import HtmlNode
 
 
 class LeafNode(HtmlNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
@@ -14,4 +17,7 @@ class LeafNode(HtmlNode):
         tag_open = f"<{self.tag}{props if props else ''}>" if self.tag else ''
         tag_close = f"</{self.tag}>" if self.tag else ''
 
-        return f'{tag_open}{self.value}{tag_close}'
\ No newline at end of file
+        return f'{tag_open}{escape_text(self.value)}{tag_close}'
+
+    def iter_html(self):
+        yield self.to_html()
@@ -1,16 +1,147 @@
+import argparse
+import os
 import sys
 
-from utils.utils import generate_pages_recursive, publish_static_files
+from builder import Builder
+from utils import utils
+from utils.assets import precompress
+from utils.block_cache import BLOCK_CACHE_PATH
+from utils.front_matter import METADATA_CACHE_PATH
+from utils.manifest import STATE_DIR
+from utils.profiling import BuildProfiler
+from utils.render_cache import DEFAULT_MAX_SIZE, RENDER_CACHE_ENV, RenderCache
+from utils.search import SEARCH_STATE_PATH, SearchIndex
+from utils.watch import Watcher
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Build the static site into docs/.')
+    parser.add_argument('basepath', nargs='?', default='/')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only re-render pages and copy static files that changed since the last build')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='render pages on N processes (0 uses every CPU core)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='overlap reading, rendering and writing pages on background threads')
+    parser.add_argument('--block-cache', action='store_true',
+                        help='keep rendered blocks in the state directory between builds')
+    parser.add_argument('--block-cache-size', type=int, default=4096,
+                        help='number of rendered blocks kept in memory (0 disables the cache)')
+    parser.add_argument('--state-dir', default=STATE_DIR, metavar='DIR',
+                        help=f'keep the manifest and other state between builds in DIR (default: {STATE_DIR})')
+    parser.add_argument('--include', action='append', default=[], metavar='GLOB',
+                        help='only render pages whose path under content/ matches GLOB (repeatable)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='GLOB',
+                        help='skip pages and directories whose path under content/ matches GLOB (repeatable)')
+    parser.add_argument('--drafts', action='store_true',
+                        help='also render pages marked draft in their front matter')
+    parser.add_argument('--render-cache', metavar='DIR', default=os.environ.get(RENDER_CACHE_ENV),
+                        help=f'reuse pages rendered from identical inputs, kept in DIR (default: ${RENDER_CACHE_ENV})')
+    parser.add_argument('--render-cache-size', type=int, default=DEFAULT_MAX_SIZE // (1024 * 1024), metavar='MB',
+                        help='remove the least recently used rendered pages once the cache is larger than this')
+    parser.add_argument('--render-cache-stats', action='store_true',
+                        help='print render cache statistics and exit')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild outputs affected by changes')
+    parser.add_argument('--minify', action='store_true',
+                        help='collapse whitespace, drop block wrappers and unquote attributes while rendering')
+    parser.add_argument('--fingerprint', action='store_true',
+                        help='copy static assets to content-hashed names and point pages at them')
+    parser.add_argument('--precompress', action='store_true',
+                        help='write .gz versions of changed html, css and js outputs')
+    parser.add_argument('--search-index', action='store_true',
+                        help='write a sharded client-side search index to docs/search/')
+    parser.add_argument('--profile', action='store_true',
+                        help='time every stage and page and print the slowest pages')
+    parser.add_argument('--report', metavar='PATH',
+                        help='write a JSON build report to PATH (implies --profile)')
+    return parser.parse_args(argv)
+
+def print_render_cache_stats(stats):
+    print(f"Cache directory  {stats['directory']}")
+    print(f"Pages            {stats['entries']}")
+    print(f"Size             {stats['size'] / (1024 * 1024):.1f} MB of {stats['max_size'] / (1024 * 1024):.1f} MB")
+    print(f"Hits             {stats['hits']}")
+    print(f"Misses           {stats['misses']}")
+    print(f"Hit rate         {stats['hit_rate']:.1%}")
 
 def main() -> int:
+    args = parse_args(sys.argv[1:])
+    basepath = args.basepath
+
+    render_cache = None
+    if args.render_cache:
+        render_cache = RenderCache(args.render_cache, args.render_cache_size * 1024 * 1024)
+    if args.render_cache_stats:
+        if render_cache is None:
+            print(f"No render cache directory given (--render-cache or ${RENDER_CACHE_ENV})")
+            return 1
+        print_render_cache_stats(render_cache.stats())
+        return 0
+
+    jobs = args.jobs or os.cpu_count() or 1
+    builder = Builder(basepath=basepath, jobs=jobs, pipeline=args.pipeline, incremental=args.incremental,
+                      minify=args.minify, block_cache_size=args.block_cache_size,
+                      include=args.include, exclude=args.exclude, drafts=args.drafts, render_cache=render_cache,
+                      state_dir=args.state_dir)
+    builder.metadata.path = builder.state_path(METADATA_CACHE_PATH)
+    builder.metadata.load()
+
+    if args.search_index:
+        utils.search_index = SearchIndex(builder.dest_dir, basepath, builder.state_path(SEARCH_STATE_PATH))
+        utils.search_index.load()
+
+    if args.block_cache:
+        builder.block_cache.path = builder.state_path(BLOCK_CACHE_PATH)
+        builder.block_cache.load()
+
+    if args.profile or args.report:
+        utils.profiler = BuildProfiler()
+
+    errors = builder.build()
+
+    for from_path, error in errors:
+        print(f"Failed to generate {from_path} - error: {error}")
+    print(f"Wrote {builder.output.written} pages, left {builder.output.skipped} identical pages untouched")
+
+    if utils.search_index is not None:
+        written = utils.search_index.write(os.path.join(builder.dest_dir, 'search'))
+        utils.search_index.save()
+        print(f"Search index: {len(utils.search_index.pages)} pages, {len(written)} files updated")
+
+    if args.fingerprint:
+        mapping, rewritten = builder.fingerprint()
+        print(f"Fingerprinted {len(mapping)} assets, rewrote {len(rewritten)} pages")
+
+    if args.precompress:
+        compressed = precompress(builder.dest_dir, max(jobs, 4))
+        print(f"Compressed {len(compressed)} files")
+
+    if args.block_cache:
+        builder.block_cache.save()
+        print(f"Block cache: {builder.block_cache.hits} hits, {builder.block_cache.misses} misses")
+
+    builder.metadata.save()
+
+    if render_cache is not None:
+        render_cache.save_stats()
+        removed = render_cache.cleanup()
+        print(f"Render cache: {render_cache.hits} hits, {render_cache.misses} misses, {removed} old pages removed")
+
+    if builder.manifest is not None:
+        print(f"Rendered {builder.manifest.rendered} pages, skipped {builder.manifest.skipped} unchanged")
 
-    
-    basepath = sys.argv[1] if len(sys.argv) > 1 else '/'
-    publish_static_files()
+    if utils.profiler is not None:
+        utils.profiler.print_slowest()
+        if args.report:
+            utils.profiler.write_report(args.report)
+        utils.profiler = None
 
-    generate_pages_recursive('content', 'template.html', 'docs', basepath)
+    if args.watch:
+        with builder.active():
+            Watcher(builder.content_dir, builder.template_path, builder.static_dir, builder.dest_dir, basepath,
+                    include=builder.include, exclude=builder.exclude, drafts=builder.drafts).run()
 
-    return 0
+    return 1 if errors else 0
 
 if __name__ == '__main__':
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,64 @@
+import re
+
+from escape import escape_attribute
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# Whitespace between tags that contains a line break is only indentation.
+INDENT_PATTERN = re.compile(r">\s*\n\s*<")
+LEADING_INDENT_PATTERN = re.compile(r"\A\s*\n\s*(?=<|\Z)")
+TRAILING_INDENT_PATTERN = re.compile(r"(?:(?<=>)|\A)\s*\n\s*\Z")
+PRESERVED_TAGS = ('pre', 'code', 'textarea', 'script', 'style')
+PRESERVED_OPEN_PATTERN = re.compile(rf"<({'|'.join(PRESERVED_TAGS)})\b", re.IGNORECASE)
+PRESERVED_CLOSE_PATTERNS = {tag: re.compile(rf"</{tag}>", re.IGNORECASE) for tag in PRESERVED_TAGS}
+UNQUOTED_VALUE_PATTERN = re.compile(r"[^\s\"'=<>`]+")
+
+
+def collapse_whitespace(text):
+    return WHITESPACE_PATTERN.sub(' ', text)
+
+def minify_text(text, after_element, before_element):
+    # Preserved elements end and start with a tag too.
+    if after_element:
+        text = LEADING_INDENT_PATTERN.sub('', text)
+    if before_element:
+        text = TRAILING_INDENT_PATTERN.sub('', text)
+    return collapse_whitespace(INDENT_PATTERN.sub('><', text))
+
+def minify_markup(html):
+    """Drops indentation between tags and collapses whitespace runs, leaving
+    pre, code, textarea, script and style elements exactly as they are.
+
+    Each opening tag is matched to its closing tag with one forward search,
+    and a tag found unclosed once is not searched for again, so unclosed
+    elements cannot make this quadratic.
+    """
+    minified = []
+    start = position = 0
+    unclosed = set()
+    while True:
+        opening = PRESERVED_OPEN_PATTERN.search(html, position)
+        if opening is None:
+            break
+        tag = opening.group(1).lower()
+        closing = None if tag in unclosed else PRESERVED_CLOSE_PATTERNS[tag].search(html, opening.end())
+        if closing is None:
+            unclosed.add(tag)
+            position = opening.end()
+            continue
+        minified.append(minify_text(html[start:opening.start()], start > 0, True))
+        minified.append(html[opening.start():closing.end()])
+        start = position = closing.end()
+    minified.append(minify_text(html[start:], start > 0, False))
+    return ''.join(minified)
+
+def minify_props(props):
+    if not props:
+        return ''
+    attributes = []
+    for key, value in props.items():
+        value = escape_attribute(value)
+        if UNQUOTED_VALUE_PATTERN.fullmatch(value):
+            attributes.append(f' {key}={value}')
+        else:
+            attributes.append(f' {key}="{value}"')
+    return ''.join(attributes)
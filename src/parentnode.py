@@ -2,26 +2,37 @@ from htmlnode import HtmlNode
 
 
 class ParentNode(HtmlNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def iter_html(self):
+        """Yields the html in chunks, walking nested ParentNodes with an
+        explicit stack instead of building a string at every level."""
+        self.check_renderable()
+        yield f"<{self.tag}>"
+
+        stack = [(self, iter(self.children))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+
+            if child is None:
+                stack.pop()
+                yield f"</{node.tag}>"
+            elif isinstance(child, ParentNode):
+                child.check_renderable()
+                yield f"<{child.tag}>"
+                stack.append((child, iter(child.children)))
+            else:
+                yield child.to_html()
+
+    def check_renderable(self):
         if not self.tag:
             raise ValueError('No tag specified.')
         if not self.children:
             raise ValueError('No children specified.')
-        
-        tag_open = f"<{self.tag}>"
-        tag_close = f"</{self.tag}>"
-
-        html = tag_open
-
-        for child in self.children:
-            html += child.to_html()
-
-        html += tag_close
-
-        return html
     
     def __repr__(self):
-        return f"ParentNode({self.tag}, {self.children}, {self.props})"
\ No newline at end of file
+        return f"ParentNode({self.tag}, {self.children}, {self.props})"
@@ -0,0 +1,86 @@
+import os
+import re
+
+from minify import minify_markup
+
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+BASEPATH_PATTERN = re.compile(r'(href|src)=("?)/')
+
+
+def rewrite_basepath(html, basepath):
+    if basepath == '/':
+        return html
+    return BASEPATH_PATTERN.sub(lambda m: f'{m.group(1)}={m.group(2)}{basepath}', html)
+
+
+class Template():
+    """A template compiled into static fragments and named slots.
+
+    The basepath rewrite (and minification, if asked for) is applied to the
+    fragments once, at compile time, so rendering a page is a single join.
+    """
+
+    def __init__(self, text, basepath='/', minify=False):
+        self.basepath = basepath
+        if minify:
+            text = minify_markup(text)
+        self.fragments = []
+        self.slots = []
+
+        position = 0
+        for match in SLOT_PATTERN.finditer(text):
+            self.fragments.append(rewrite_basepath(text[position:match.start()], basepath))
+            self.slots.append((match.group(1), match.group(0)))
+            position = match.end()
+        self.fragments.append(rewrite_basepath(text[position:], basepath))
+
+    def parts(self, **values):
+        yield self.fragments[0]
+        for (name, raw), fragment in zip(self.slots, self.fragments[1:]):
+            yield values.get(name, raw)
+            yield fragment
+
+    def render(self, **values):
+        return ''.join(self.parts(**values))
+
+    def write(self, file, **values):
+        """Writes the page to file. Slot values may be strings or iterables
+        of string chunks, which are streamed without being joined."""
+        for part in self.parts(**values):
+            if isinstance(part, str):
+                file.write(part)
+            else:
+                file.writelines(part)
+
+    def __repr__(self):
+        return f"Template({[name for name, _ in self.slots]}, {self.basepath})"
+
+
+class TemplateCache():
+    """Compiled templates by name or path, recompiled when the file changes."""
+
+    def __init__(self, templates=None):
+        self.names = dict(templates or {})
+        self._compiled = {}
+
+    def register(self, name, path):
+        self.names[name] = path
+
+    def get(self, name, basepath='/', minify=False):
+        path = self.names.get(name, name)
+        stat = os.stat(path)
+        key = (path, basepath, minify)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._compiled.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with open(path, 'r') as file:
+            template = Template(file.read(), basepath, minify)
+
+        self._compiled[key] = (signature, template)
+        return template
+
+    def clear(self):
+        self._compiled.clear()
@@ -0,0 +1,77 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from test_generate_pages import write_file
+from utils.assets import fingerprint_assets, fingerprinted_name, precompress, rewrite_asset_references, rewrite_pages
+
+
+class TestAssets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.tmp.name, 'static')
+        self.docs = os.path.join(self.tmp.name, 'docs')
+        self.state = os.path.join(self.tmp.name, 'cache', 'assets.json')
+        for root in (self.static, self.docs):
+            write_file(os.path.join(root, 'index.css'), 'body {}')
+            write_file(os.path.join(root, 'images', 'a.png'), 'png')
+        write_file(os.path.join(self.docs, 'index.html'),
+                   '<link href="/site/index.css"><img src="/site/images/a.png"><a href="/site/other">x</a>')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fingerprinted_name(self):
+        self.assertEqual(fingerprinted_name(os.path.join('images', 'a.png'), 'abcd1234'), os.path.join('images', 'a.abcd1234.png'))
+
+    def test_fingerprint_and_rewrite(self):
+        mapping = fingerprint_assets(self.static, self.docs, self.state)
+        hashed_css = mapping['index.css']
+        self.assertTrue(os.path.exists(os.path.join(self.docs, hashed_css)))
+
+        self.assertEqual(rewrite_pages(self.docs, mapping, '/site/'), [os.path.join(self.docs, 'index.html')])
+        with open(os.path.join(self.docs, 'index.html')) as file:
+            html = file.read()
+        self.assertIn(f'href="/site/{hashed_css}"', html)
+        self.assertIn('href="/site/other"', html)
+        self.assertEqual(rewrite_pages(self.docs, mapping, '/site/'), [])
+
+    def test_changed_asset_removes_old_hash(self):
+        old = fingerprint_assets(self.static, self.docs, self.state)['index.css']
+        for root in (self.static, self.docs):
+            os.remove(os.path.join(root, 'index.css'))
+            write_file(os.path.join(root, 'index.css'), 'body { color: red }')
+        new = fingerprint_assets(self.static, self.docs, self.state)['index.css']
+
+        self.assertNotEqual(old, new)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, old)))
+
+    def test_rewrite_moves_previous_hashes_on(self):
+        html = '<link href="/index.1.css"><link href="/index.css"><img src="/a.1.png">'
+        mapping = {'index.css': 'index.2.css', 'a.png': 'a.1.png'}
+        previous = {'index.css': 'index.1.css', 'a.png': 'a.1.png'}
+        self.assertEqual(rewrite_asset_references(html, mapping, '/', previous),
+                         '<link href="/index.2.css"><link href="/index.2.css"><img src="/a.1.png">')
+
+    def test_rewrite_ignores_unknown(self):
+        html = '<a href="/index.css.map">'
+        self.assertEqual(rewrite_asset_references(html, {'index.css': 'index.1.css'}), html)
+
+    def test_precompress_only_changed(self):
+        compressed = precompress(self.docs, jobs=2)
+        self.assertEqual(compressed, [os.path.join(self.docs, 'index.css'), os.path.join(self.docs, 'index.html')])
+        with gzip.open(os.path.join(self.docs, 'index.css.gz'), 'rt') as file:
+            self.assertEqual(file.read(), 'body {}')
+        self.assertEqual(precompress(self.docs), [])
+
+    def test_precompress_file_replaced_by_older_copy(self):
+        css = os.path.join(self.docs, 'index.css')
+        precompress(self.docs)
+        write_file(css, 'body { color: blue }')
+        os.utime(css, ns=(0, 1_000_000_000))
+
+        self.assertEqual(precompress(self.docs), [css])
+        with gzip.open(css + '.gz', 'rt') as file:
+            self.assertEqual(file.read(), 'body { color: blue }')
+        self.assertEqual(precompress(self.docs), [])
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from utils.block_cache import BlockCache
+from utils import utils
+from utils.utils import markdown_to_html_chunks
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = BlockCache()
+        self.assertEqual(cache.render("a", str.upper), "A")
+        self.assertEqual(cache.render("a", lambda b: "not called"), "A")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = BlockCache(maxsize=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+
+        self.assertEqual(cache.get("a"), "A")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_disabled(self):
+        cache = BlockCache(maxsize=0)
+        cache.put("a", "A")
+        self.assertEqual(len(cache), 0)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache', 'blocks.json')
+            cache = BlockCache(path=path)
+            cache.put("a", "A")
+            cache.save()
+
+            loaded = BlockCache(path=path)
+            loaded.load()
+            self.assertEqual(loaded.get("a"), "A")
+
+    def test_cached_chunks_match_uncached(self):
+        md = "# Title\n\nShared **footer**\n\n- a\n- b\n\nShared **footer**"
+        cache = BlockCache()
+        cached = ''.join(markdown_to_html_chunks(md.split('\n'), cache))
+
+        self.assertEqual(cached, ''.join(markdown_to_html_chunks(md.split('\n'))))
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_cached_blocks_are_not_classified(self):
+        md = "# Title\n\n- a\n- b"
+        cache = BlockCache()
+        first = ''.join(markdown_to_html_chunks(md.split('\n'), cache))
+
+        with patch.object(utils, 'classify_block', side_effect=AssertionError('classified')):
+            self.assertEqual(''.join(markdown_to_html_chunks(md.split('\n'), cache)), first)
@@ -0,0 +1,113 @@
+import random
+import re
+import unittest
+
+from block_markdown import BlockType, classify_block
+from leafnode import LeafNode
+from parentnode import ParentNode
+from utils.utils import (block_to_block_type, block_to_node, handle_children_text, handle_list_children,
+                         heading_type_block_to_html_node, payload_to_node)
+
+
+def check_every_line_start_with(lines: list[str], pattern):
+    for line in lines:
+        if not line.startswith(pattern):
+            return False
+    return True
+
+def check_ordered_list_block(lines: list[str]):
+    for n in range(len(lines)):
+        if not lines[n].startswith(f'{n+1}. '):
+            return False
+    return True
+
+def reference_block_type(block):
+    """The multi-pass classifier the single-pass one replaced."""
+    if re.match(r"^#{1,6} ", block):
+        return BlockType.HEADING
+    if block.startswith("```") and block.endswith("```"):
+        return BlockType.CODE
+    if check_every_line_start_with(block.split('\n'), '>'):
+        return BlockType.QUOTE
+    if check_every_line_start_with(block.split('\n'), '- '):
+        return BlockType.UNORDERED_LIST
+    if check_ordered_list_block(block.split('\n')):
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+def reference_block_to_html(block, block_type):
+    match(block_type):
+        case BlockType.PARAGRAPH:
+            nodes = handle_children_text(block)
+        case BlockType.HEADING:
+            nodes = [heading_type_block_to_html_node(block)]
+        case BlockType.CODE:
+            nodes = [LeafNode('code', block.strip('`'))]
+        case BlockType.QUOTE:
+            text = re.sub(r"^>", '', block, flags=re.MULTILINE)
+            nodes = [ParentNode('blockquote', handle_children_text(text.strip(' ')))]
+        case BlockType.UNORDERED_LIST:
+            stripped_block = re.sub(r"^- ", '', block, flags=re.MULTILINE)
+            nodes = [ParentNode('ul', handle_list_children(stripped_block.split('\n')))]
+        case BlockType.ORDERED_LIST:
+            stripped_block = re.sub(r"^\d\. ", '', block, flags=re.MULTILINE)
+            nodes = [ParentNode('ol', handle_list_children(stripped_block.split('\n')))]
+    return ParentNode('div', nodes).to_html()
+
+LINES = [
+    "# Heading", "## Heading **bold**", "###### six", "####### seven", "#no space",
+    "> quoted", ">tight quote", "> _italic_ quote", ">",
+    "- item", "- [link](/a) item", "-no space", "- ",
+    "1. one", "2. two", "3. three", "10. ten", "1.no space",
+    "```", "```code```", "code line ```",
+    "plain text", "text with `code`", "![img](/i.png) and text", "## not a heading ## twice",
+]
+
+def corpus(seed=0, size=2000):
+    rng = random.Random(seed)
+    blocks = [
+        "1. a\n2. b\n3. c\n4. d\n5. e\n6. f\n7. g\n8. h\n9. i\n10. j\n11. k",
+        "## Heading ## with prefix repeated",
+        "```\ncode\n\nmore code\n```",
+        "> a\n> b\n- c",
+    ]
+    for _ in range(size):
+        if rng.random() < 0.3:
+            prefix = rng.choice(["> ", "- ", None])
+            count = rng.randint(1, 12)
+            lines = [f"{prefix or f'{n + 1}. '}{rng.choice(LINES)}" for n in range(count)]
+        else:
+            lines = [rng.choice(LINES) for _ in range(rng.randint(1, 4))]
+        block = '\n'.join(lines).strip()
+        if block:
+            blocks.append(block)
+    return blocks
+
+
+class TestBlockClassifier(unittest.TestCase):
+    def test_types_match_reference(self):
+        for block in corpus():
+            self.assertEqual(block_to_block_type(block), reference_block_type(block), block)
+            self.assertEqual(classify_block(block.split('\n'))[0], reference_block_type(block), block)
+
+    def test_html_matches_reference(self):
+        for block in corpus(seed=1):
+            block_type = reference_block_type(block)
+            try:
+                expected = reference_block_to_html(block, block_type)
+            except ValueError:
+                with self.assertRaises(ValueError):
+                    payload_to_node(*classify_block(block.split('\n'))).to_html()
+                continue
+            self.assertEqual(payload_to_node(*classify_block(block.split('\n'))).to_html(), expected, block)
+            self.assertEqual(block_to_node(block, block_type).to_html(), expected, block)
+
+    def test_explicit_type_matches_reference(self):
+        block = ">This is a quote.\nnot quoted"
+        self.assertEqual(block_to_node(block, BlockType.QUOTE).to_html(), reference_block_to_html(block, BlockType.QUOTE))
+
+    def test_list_payloads(self):
+        self.assertEqual(classify_block(["- a ", "- b"]), (BlockType.UNORDERED_LIST, ["a", "b"]))
+        self.assertEqual(classify_block(["1. a", "2. b"]), (BlockType.ORDERED_LIST, ["a", "b"]))
+        self.assertEqual(classify_block(["> a", ">b"]), (BlockType.QUOTE, "a\nb"))
+        self.assertEqual(classify_block(["## a"]), (BlockType.HEADING, ("## ", "a")))
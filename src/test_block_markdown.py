@@ -0,0 +1,59 @@
+import glob
+import io
+import os
+import unittest
+
+from block_markdown import BlockType, iter_markdown_blocks
+from utils.utils import block_to_block_type, markdown_to_blocks, markdown_to_html_chunks, markdown_to_html_node
+
+CONTENT_DIR = os.path.join(os.path.dirname(__file__), '..', 'content')
+
+
+class TestBlockLexer(unittest.TestCase):
+    def test_blocks_and_types(self):
+        md = "# Title\n\nSome text\nmore text\n\n\n- a\n- b\n\n1. x\n2. y\n\n> quote\n"
+        self.assertEqual(
+            list(iter_markdown_blocks(io.StringIO(md))),
+            [
+                (BlockType.HEADING, "# Title"),
+                (BlockType.PARAGRAPH, "Some text\nmore text"),
+                (BlockType.UNORDERED_LIST, "- a\n- b"),
+                (BlockType.ORDERED_LIST, "1. x\n2. y"),
+                (BlockType.QUOTE, "> quote"),
+            ]
+        )
+
+    def test_fenced_code_with_blank_lines(self):
+        md = "before\n\n```\ndef f():\n\n    return 1\n```\nafter"
+        self.assertEqual(
+            list(iter_markdown_blocks(md.split('\n'))),
+            [
+                (BlockType.PARAGRAPH, "before"),
+                (BlockType.CODE, "```\ndef f():\n\n    return 1\n```"),
+                (BlockType.PARAGRAPH, "after"),
+            ]
+        )
+
+    def test_single_line_code(self):
+        self.assertEqual(list(iter_markdown_blocks(["```code```"])), [(BlockType.CODE, "```code```")])
+
+    def test_unclosed_fence(self):
+        self.assertEqual(
+            list(iter_markdown_blocks(["```", "code", "", "more"])),
+            [(BlockType.PARAGRAPH, "```\ncode\n\nmore")]
+        )
+
+    def test_matches_split_blocks_on_content(self):
+        for path in glob.glob(os.path.join(CONTENT_DIR, '**', '*.md'), recursive=True):
+            with open(path) as file:
+                markdown = file.read()
+            expected = [(block_to_block_type(block), block) for block in markdown_to_blocks(markdown)]
+            self.assertEqual(list(iter_markdown_blocks(io.StringIO(markdown))), expected, path)
+
+    def test_html_chunks_match_node(self):
+        md = "# T\n\nSome **bold** text\n\n- a\n- b"
+        self.assertEqual(''.join(markdown_to_html_chunks(md.split('\n'))), markdown_to_html_node(md).to_html())
+
+    def test_html_chunks_empty(self):
+        with self.assertRaises(ValueError):
+            list(markdown_to_html_chunks(["", ""]))
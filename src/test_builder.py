@@ -0,0 +1,178 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from builder import Builder
+from test_generate_pages import read_tree, write_file
+from utils import utils
+
+
+class TestBuilder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, 'content')
+        self.static = os.path.join(self.root, 'static')
+        self.docs = os.path.join(self.root, 'docs')
+        self.template = os.path.join(self.root, 'template.html')
+
+        write_file(self.template, '<title>{{ Title }}</title><link href="/index.css">{{ Content }}')
+        write_file(os.path.join(self.static, 'index.css'), 'body {}')
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n\nWelcome')
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# Post\n\nSome _text_')
+        write_file(os.path.join(self.content, 'blog', 'old.md'), '# Old\n\nOld post')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def builder(self, **kwargs):
+        kwargs.setdefault('state_dir', os.path.join(self.root, 'state'))
+        return Builder(self.content, self.template, self.static, self.docs, '/site/', **kwargs)
+
+    def test_build(self):
+        self.assertEqual(self.builder().build(), [])
+        tree = read_tree(self.docs)
+        self.assertEqual(sorted(tree), ['blog/old.html', 'blog/post.html', 'index.css', 'index.html'])
+        self.assertEqual(tree['blog/post.html'],
+                         '<title>Post</title><link href="/site/index.css"><div><div><h1>Post</h1></div><div>Some <i>text</i></div></div>')
+
+    def test_incremental_build(self):
+        builder = self.builder(incremental=True)
+        builder.build()
+        self.assertEqual(builder.manifest.rendered, 3)
+
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n\nChanged')
+        os.remove(os.path.join(self.content, 'blog', 'old.md'))
+        builder.build()
+        self.assertEqual((builder.manifest.rendered, builder.manifest.skipped), (1, 1))
+        self.assertEqual(sorted(read_tree(self.docs)), ['blog/post.html', 'index.css', 'index.html'])
+
+    def test_incremental_fingerprint_follows_changed_assets(self):
+        builder = self.builder(incremental=True)
+        builder.build()
+        first, _ = builder.fingerprint()
+
+        write_file(os.path.join(self.static, 'index.css'), 'body { color: red }')
+        builder.build()
+        mapping, rewritten = builder.fingerprint()
+
+        self.assertEqual(builder.manifest.rendered, 0)
+        self.assertNotEqual(mapping['index.css'], first['index.css'])
+        self.assertEqual(len(rewritten), 3)
+        tree = read_tree(self.docs)
+        self.assertIn(f'href="/site/{mapping["index.css"]}"', tree['index.html'])
+        self.assertEqual(tree[mapping['index.css']], 'body { color: red }')
+        self.assertNotIn(first['index.css'], tree)
+
+    def test_incremental_build_removes_new_drafts(self):
+        post = os.path.join(self.content, 'blog', 'post.md')
+        self.builder(incremental=True).build()
+        write_file(post, '---\ndraft: true\n---\n# Post\n\nNot ready')
+        builder = self.builder(incremental=True)
+        builder.build()
+        self.assertEqual(sorted(read_tree(self.docs)), ['blog/old.html', 'index.css', 'index.html'])
+
+        builder = self.builder(incremental=True, exclude=['blog/*'])
+        builder.build()
+        self.assertEqual(sorted(read_tree(self.docs)), ['index.css', 'index.html'])
+
+    def test_incremental_build_keeps_failed_page(self):
+        post = os.path.join(self.content, 'blog', 'post.md')
+        self.builder(incremental=True).build()
+        write_file(post, '---\ntitle: Never closed\n# Post')
+        errors = self.builder(incremental=True).build()
+        self.assertEqual([from_path for from_path, _ in errors], [post])
+        self.assertIn('blog/post.html', read_tree(self.docs))
+
+    def test_full_build_discards_manifest(self):
+        self.builder(incremental=True).build()
+        Builder(self.content, self.template, self.static, self.docs, '/other/',
+                state_dir=os.path.join(self.root, 'state')).build()
+        builder = self.builder(incremental=True)
+        builder.build()
+
+        self.assertEqual(builder.manifest.rendered, 3)
+        self.assertIn('href="/site/index.css"', read_tree(self.docs)['index.html'])
+
+    def test_state_dirs_are_separate(self):
+        other_docs = os.path.join(self.root, 'other')
+        other = Builder(self.content, self.template, self.static, other_docs, '/other/', incremental=True,
+                        state_dir=os.path.join(self.root, 'other-state'))
+        builder = self.builder(incremental=True)
+        builder.build()
+        other.build()
+        self.assertEqual(sorted(os.listdir(os.path.join(self.root, 'other-state'))), ['manifest.json', 'static.json'])
+
+        builder.build()
+        other.build()
+        self.assertEqual((builder.manifest.rendered, builder.manifest.skipped), (0, 3))
+        self.assertEqual((other.manifest.rendered, other.manifest.skipped), (0, 3))
+
+    def test_drafts(self):
+        write_file(os.path.join(self.content, 'blog', 'wip.md'), '---\ntitle: Work in progress\ndraft: true\n---\nSoon')
+        builder = self.builder()
+        builder.build()
+        self.assertNotIn('blog/wip.html', read_tree(self.docs))
+        self.assertEqual([meta.title for _, _, meta in builder.pages_meta() if meta.draft], ['Work in progress'])
+
+        self.builder(drafts=True).build()
+        self.assertIn('<title>Work in progress</title><link href="/site/index.css"><div><div>Soon</div></div>',
+                      read_tree(self.docs)['blog/wip.html'])
+
+    def test_unreadable_front_matter_fails_alone(self):
+        unclosed = os.path.join(self.content, 'blog', 'unclosed.md')
+        undecodable = os.path.join(self.content, 'blog', 'undecodable.md')
+        write_file(unclosed, '---\ntitle: Never closed\n# Title')
+        with open(undecodable, 'wb') as file:
+            file.write(b'\xff\xfe not utf-8')
+
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs):
+                errors = self.builder(jobs=jobs).build()
+                self.assertEqual(sorted(from_path for from_path, _ in errors), [unclosed, undecodable])
+                self.assertEqual(sorted(read_tree(self.docs)), ['blog/old.html', 'blog/post.html', 'index.css', 'index.html'])
+
+    def test_build_paths(self):
+        builder = self.builder()
+        errors = builder.build_paths([os.path.join(self.content, 'blog', 'post.md')])
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(read_tree(self.docs)), ['blog/post.html'])
+
+    def test_render_string(self):
+        html = self.builder(minify=True).render_string('# Draft\n\n[a  link](/x)')
+        self.assertEqual(html, '<title>Draft</title><link href="/site/index.css"><div><h1>Draft</h1><div><a href=/site/x>a link</a></div></div>')
+        self.assertFalse(os.path.exists(self.docs))
+
+    def test_caches_stay_warm(self):
+        builder = self.builder()
+        builder.render_string('# Draft\n\nOne')
+        with patch('template.Template.__init__', side_effect=AssertionError('recompiled')):
+            builder.render_string('# Draft\n\nOne')
+        self.assertEqual(builder.block_cache.hits, 2)
+
+    def test_globals_restored(self):
+        template_cache, block_cache = utils.template_cache, utils.block_cache
+        builder = self.builder(minify=True)
+        builder.render_string('# Draft')
+        self.assertIs(utils.template_cache, template_cache)
+        self.assertIs(utils.block_cache, block_cache)
+        self.assertFalse(utils.minify)
+
+    def test_builders_on_threads(self):
+        builders = {True: self.builder(minify=True), False: self.builder()}
+        expected = {minify: builder.render_string('# A\n\n[a  link](/x)') for minify, builder in builders.items()}
+        results = []
+
+        def render(minify):
+            for _ in range(200):
+                results.append(builders[minify].render_string('# A\n\n[a  link](/x)') == expected[minify])
+
+        threads = [threading.Thread(target=render, args=(minify,)) for minify in (True, False, True, False)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(results))
+        self.assertFalse(utils.minify)
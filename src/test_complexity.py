@@ -0,0 +1,99 @@
+import math
+import time
+import unittest
+
+from block_markdown import iter_classified_blocks
+from escape import escape_text
+from minify import minify_markup
+from textnode import TextNode, TextType
+from utils.utils import (extract_markdown_images, extract_markdown_links, markdown_to_html_node, split_nodes_delimiter,
+                         split_nodes_image, split_nodes_link, text_to_textnodes)
+
+# Time grows by GROWTH when the input does; linear code stays near a slope
+# of 1 on a log-log scale and quadratic code near 2.
+GROWTH = 8
+MAX_SLOPE = 1.5
+# Inputs are doubled until the smaller run takes this long, so timer noise
+# does not dominate.
+MIN_SECONDS = 0.002
+MAX_SIZE = 1 << 20
+
+
+def text(value):
+    return [TextNode(value, TextType.TEXT)]
+
+def ordered_list(n):
+    return ''.join(f'{i + 1}. item\n' for i in range(n))
+
+# name: (make input of size n, function under test)
+ADVERSARIAL_INPUTS = {
+    'unmatched underscores': (lambda n: text('_' * (2 * n + 1)), lambda nodes: split_nodes_delimiter(nodes, '_', TextType.ITALIC)),
+    'many delimiter pairs': (lambda n: text('a_b_' * n), lambda nodes: split_nodes_delimiter(nodes, '_', TextType.ITALIC)),
+    'run of open brackets': (lambda n: '[' * n, extract_markdown_links),
+    'nested brackets': (lambda n: '[' * n + 'a' + ']' * n + '(/url)', extract_markdown_links),
+    'unclosed link urls': (lambda n: '[a](' * n, extract_markdown_links),
+    'run of image openers': (lambda n: '![' * n, extract_markdown_images),
+    'many links in a paragraph': (lambda n: text('see [a](/b) ' * n), split_nodes_link),
+    'many images in a paragraph': (lambda n: text('see ![a](/b.png) ' * n), split_nodes_image),
+    'inline unmatched underscores': (lambda n: 'a_' * n + 'a', text_to_textnodes),
+    'inline open brackets': (lambda n: '[' * n, text_to_textnodes),
+    'inline unclosed link urls': (lambda n: '[a](' * n, text_to_textnodes),
+    'inline alternating delimiters': (lambda n: '_`' * n, text_to_textnodes),
+    'inline everything': (lambda n: '**a** _b_ `c` [d](/e) ![f](/g) ' * n, text_to_textnodes),
+    'unclosed fence': (lambda n: '```\n' + 'x\n' * n, lambda markdown: list(iter_classified_blocks(markdown.split('\n')))),
+    'run of fences': (lambda n: '```\n' * n, lambda markdown: list(iter_classified_blocks(markdown.split('\n')))),
+    'long unordered list': (lambda n: '- item\n' * n, lambda markdown: markdown_to_html_node(markdown).to_html()),
+    'long ordered list': (ordered_list, lambda markdown: markdown_to_html_node(markdown).to_html()),
+    'long quote': (lambda n: '> line\n' * n, lambda markdown: markdown_to_html_node(markdown).to_html()),
+    'many blocks': (lambda n: '# h\n\n' * n, lambda markdown: markdown_to_html_node(markdown).to_html()),
+    'long paragraph of links': (lambda n: 'a [b](/c)\n' * n, lambda markdown: markdown_to_html_node(markdown).to_html()),
+    'unclosed preserved tags': (lambda n: '<code>' * n, minify_markup),
+    'escaped characters': (lambda n: '<&>' * n, escape_text),
+}
+
+
+def best_time(function, value, repeat=3):
+    best = math.inf
+    for _ in range(repeat):
+        # CPU time of this process, so other processes do not skew it.
+        started = time.process_time()
+        try:
+            function(value)
+        except ValueError:
+            # Malformed input may be rejected; it only has to be rejected fast.
+            pass
+        best = min(best, time.process_time() - started)
+    return best
+
+def growth_slope(make, function, size=256):
+    """Slope of log(time) against log(size) between size and GROWTH * size,
+    with size doubled until the smaller input is slow enough to time."""
+    small = best_time(function, make(size))
+    while small < MIN_SECONDS and size * GROWTH < MAX_SIZE:
+        size *= 2
+        small = best_time(function, make(size))
+    large = best_time(function, make(size * GROWTH))
+    return math.log(large / small) / math.log(GROWTH)
+
+
+class TestWorstCaseComplexity(unittest.TestCase):
+    def test_linear_growth(self):
+        for name, (make, function) in ADVERSARIAL_INPUTS.items():
+            with self.subTest(name):
+                slope = growth_slope(make, function)
+                if slope > MAX_SLOPE:
+                    # One retry, so a busy machine does not fail the suite.
+                    slope = growth_slope(make, function)
+                self.assertLessEqual(slope, MAX_SLOPE, f"{name} grows like n^{slope:.2f}")
+
+    def test_detects_quadratic_growth(self):
+        quadratic = lambda n: sum(1 for i in range(n) for _ in range(i))
+        self.assertGreater(growth_slope(lambda n: n // 8, quadratic), MAX_SLOPE)
+
+    def test_no_recursion_limit(self):
+        n = 50000
+        self.assertEqual(len(split_nodes_link(text('[a](/b)' * n))), n)
+        self.assertEqual(len(split_nodes_image(text('![a](/b)' * n))), n)
+        nested = '[' * n + 'a' + ']' * n + '(/u)'
+        self.assertEqual([node.text for node in text_to_textnodes(nested)], [nested])
+        self.assertEqual(markdown_to_html_node('- a\n' * n).to_html().count('<li>'), n)
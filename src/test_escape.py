@@ -0,0 +1,47 @@
+import unittest
+
+from escape import Markup, escape_attribute, escape_text
+from htmlnode import HtmlNode
+from leafnode import LeafNode
+from parentnode import ParentNode
+from utils.utils import markdown_to_html_node
+
+
+class TestEscape(unittest.TestCase):
+    def test_plain_text_returned_as_is(self):
+        text = 'nothing to escape "here"'
+        self.assertIs(escape_text(text), text)
+        self.assertIs(escape_attribute('/images/a.png'), '/images/a.png')
+
+    def test_escape_text(self):
+        self.assertEqual(escape_text('a < b && c > "d"'), 'a &lt; b &amp;&amp; c &gt; "d"')
+
+    def test_escape_attribute(self):
+        self.assertEqual(escape_attribute('/a?x=1&y="2"<'), '/a?x=1&amp;y=&quot;2&quot;&lt;')
+        self.assertEqual(escape_attribute(None), '')
+        self.assertEqual(escape_attribute(3), '3')
+
+    def test_markup_not_escaped_again(self):
+        markup = Markup(escape_text('<b>'))
+        self.assertIs(escape_text(markup), markup)
+        self.assertIs(escape_attribute(markup), markup)
+        self.assertEqual(LeafNode(None, markup).to_html(), '&lt;b&gt;')
+
+    def test_nodes_escape_values_and_props(self):
+        node = ParentNode('p', [
+            LeafNode(None, 'x < y'),
+            LeafNode('a', 'Q&A', {'href': '/q?a=1&b="2"'}),
+            HtmlNode('img', '', props={'alt': '<alt>'}),
+        ])
+        self.assertEqual(
+            node.to_html(),
+            '<p>x &lt; y<a href="/q?a=1&amp;b=&quot;2&quot;">Q&amp;A</a><img  alt="&lt;alt&gt;"></img></p>'
+        )
+
+    def test_markdown_escaped(self):
+        html = markdown_to_html_node('[<Back](/a?b&c) `<div>`\n\n```\nif a < b && c:\n```').to_html()
+        self.assertEqual(
+            html,
+            '<div><div><a href="/a?b&amp;c">&lt;Back</a> <code>&lt;div&gt;</code></div>'
+            '<div><code>\nif a &lt; b &amp;&amp; c:\n</code></div></div>'
+        )
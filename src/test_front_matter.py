@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+import unittest
+
+from test_generate_pages import write_file
+from utils.front_matter import MetadataCache, PageMeta, read_header, split_front_matter
+
+PAGE = """---
+title: "Tom: a Mistake?"
+date: 2024-05-01
+tags: [tolkien, 'essays']
+draft: yes
+author: Archmage
+---
+
+# Why Tom Bombadil Was a Mistake
+
+Body
+"""
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_read_header(self):
+        file = io.StringIO(PAGE)
+        meta, first_line = read_header(file)
+        self.assertEqual(meta, PageMeta('Tom: a Mistake?', '2024-05-01', ['tolkien', 'essays'], True, {'author': 'Archmage'}))
+        self.assertEqual(first_line, '# Why Tom Bombadil Was a Mistake\n')
+        self.assertEqual(file.read(), '\nBody\n')
+
+    def test_title_from_heading(self):
+        meta, first_line = read_header(io.StringIO('---\ntags: a, b\n---\n# Heading\n'))
+        self.assertEqual((meta.title, meta.tags, meta.draft), ('Heading', ['a', 'b'], False))
+
+    def test_no_front_matter(self):
+        file = io.StringIO('# Tolkien Fan Club\n\nText')
+        meta, first_line = read_header(file)
+        self.assertEqual(meta, PageMeta('Tolkien Fan Club'))
+        self.assertEqual(first_line, '# Tolkien Fan Club\n')
+        self.assertIsNone(read_header(io.StringIO('Text'))[0].title)
+
+    def test_unclosed(self):
+        with self.assertRaises(ValueError):
+            read_header(io.StringIO('---\ntitle: x\n# Heading\n'))
+
+    def test_split_front_matter(self):
+        meta, body = split_front_matter(PAGE)
+        self.assertEqual(meta.title, 'Tom: a Mistake?')
+        self.assertEqual(body, '# Why Tom Bombadil Was a Mistake\n\nBody\n')
+        self.assertEqual(split_front_matter('# A\n\nB'), (PageMeta('A'), '# A\n\nB'))
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.page = os.path.join(self.tmp.name, 'post.md')
+        write_file(self.page, PAGE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cached_by_mtime(self):
+        cache = MetadataCache()
+        self.assertTrue(cache.get(self.page).draft)
+        self.assertTrue(cache.get(self.page).draft)
+        self.assertEqual(cache.reads, 1)
+
+        write_file(self.page, PAGE.replace('draft: yes', 'draft: no'))
+        os.utime(self.page, ns=(0, 1_000_000_000))
+        self.assertFalse(cache.get(self.page).draft)
+        self.assertEqual(cache.reads, 2)
+
+    def test_persisted(self):
+        path = os.path.join(self.tmp.name, 'cache', 'metadata.json')
+        cache = MetadataCache(path)
+        meta = cache.get(self.page)
+        cache.save()
+
+        loaded = MetadataCache(path)
+        loaded.load()
+        self.assertEqual(dict(loaded.scan([self.page])), {self.page: meta})
+        self.assertEqual(loaded.reads, 0)
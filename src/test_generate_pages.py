@@ -0,0 +1,127 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from utils import utils
+from utils.block_cache import BlockCache
+from utils.output import OutputWriter
+from utils.utils import collect_pages, generate_pages
+
+
+def write_file(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(text)
+
+
+def read_tree(root):
+    tree = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path) as file:
+                tree[os.path.relpath(path, root)] = file.read()
+    return tree
+
+
+class TestGeneratePages(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, 'content')
+        self.template = os.path.join(self.root, 'template.html')
+
+        write_file(self.template, '<title>{{ Title }}</title><a href="/x">{{ Content }}</a>')
+        for n in range(6):
+            write_file(os.path.join(self.content, f'dir{n % 2}', f'page{n}.md'), f'# Page {n}\n\nSome **bold** [link](/p{n})')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_collect_pages_sorted(self):
+        pages = collect_pages(self.content, 'docs')
+        self.assertEqual(pages, sorted(pages))
+        self.assertEqual(pages[0], (os.path.join(self.content, 'dir0', 'page0.md'), os.path.join('docs', 'dir0', 'page0.html')))
+        self.assertEqual(len(pages), 6)
+
+    def test_parallel_matches_serial(self):
+        serial = os.path.join(self.root, 'serial')
+        parallel = os.path.join(self.root, 'parallel')
+
+        generate_pages(collect_pages(self.content, serial), self.template, '/base/')
+        errors = generate_pages(collect_pages(self.content, parallel), self.template, '/base/', jobs=3)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(read_tree(serial), read_tree(parallel))
+
+    def test_spawned_workers_use_settings(self):
+        serial = os.path.join(self.root, 'serial')
+        parallel = os.path.join(self.root, 'parallel')
+        spawn_pool = partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context('spawn'))
+
+        utils.minify = True
+        try:
+            generate_pages(collect_pages(self.content, serial), self.template, '/base/')
+            with patch.object(utils, 'ProcessPoolExecutor', spawn_pool):
+                errors = generate_pages(collect_pages(self.content, parallel), self.template, '/base/', jobs=2)
+        finally:
+            utils.minify = False
+
+        self.assertEqual(errors, [])
+        self.assertEqual(read_tree(serial), read_tree(parallel))
+
+    def test_parallel_block_cache(self):
+        dest = os.path.join(self.root, 'docs')
+        cache = utils.block_cache = BlockCache()
+        try:
+            generate_pages(collect_pages(self.content, dest), self.template, '/', jobs=2)
+            self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 12, 12))
+            generate_pages(collect_pages(self.content, dest), self.template, '/', jobs=2)
+        finally:
+            utils.block_cache = BlockCache()
+
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (12, 12, 12))
+
+    def test_parallel_collects_every_error(self):
+        write_file(os.path.join(self.content, 'dir0', 'bad1.md'), 'no title')
+        write_file(os.path.join(self.content, 'dir1', 'bad2.md'), 'no title either')
+        dest = os.path.join(self.root, 'docs')
+
+        errors = generate_pages(collect_pages(self.content, dest), self.template, '/', jobs=2)
+
+        self.assertEqual([os.path.basename(f) for f, _ in errors], ['bad1.md', 'bad2.md'])
+        self.assertEqual(len(read_tree(dest)), 6)
+
+    def test_unchanged_pages_not_rewritten(self):
+        dest = os.path.join(self.root, 'docs')
+        pages = collect_pages(self.content, dest)
+        generate_pages(pages, self.template, '/')
+        for _, dest_path in pages:
+            os.utime(dest_path, ns=(0, 1_000_000_000))
+
+        write_file(os.path.join(self.content, 'dir0', 'page0.md'), '# Page 0\n\nEdited')
+        writer = utils.output_writer = OutputWriter()
+        try:
+            for jobs, pipeline in ((1, False), (2, False), (1, True)):
+                generate_pages(pages, self.template, '/', jobs, pipeline)
+        finally:
+            utils.output_writer = OutputWriter()
+
+        self.assertEqual((writer.written, writer.skipped), (1, 17))
+        mtimes = {os.path.basename(dest_path): os.stat(dest_path).st_mtime_ns for _, dest_path in pages}
+        self.assertEqual([name for name, mtime in mtimes.items() if mtime != 1_000_000_000], ['page0.html'])
+
+    def test_failed_page_keeps_previous_output(self):
+        dest = os.path.join(self.root, 'docs')
+        pages = collect_pages(self.content, dest)
+        generate_pages(pages, self.template, '/')
+        before = read_tree(dest)
+
+        write_file(os.path.join(self.content, 'dir0', 'page0.md'), '# Page 0\n\n**unclosed')
+        with self.assertRaises(ValueError):
+            generate_pages(pages, self.template, '/')
+        self.assertEqual(read_tree(dest), before)
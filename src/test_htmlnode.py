@@ -16,3 +16,11 @@ class TestHtmlNode(unittest.TestCase):
     def test_children_is_none(self):
         node = HtmlNode('<p>','Hi again', props={'id': 'unique', 'class': 'red,big'})
         self.assertIsNone(node.children)
+
+    def test_slots(self):
+        node = HtmlNode('p', 'Hi again')
+        self.assertFalse(hasattr(node, '__dict__'))
+
+    def test_tag_interned(self):
+        tag = ''.join(['se', 'ction'])
+        self.assertIs(HtmlNode(tag, 'a').tag, HtmlNode('section', 'b').tag)
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from test_generate_pages import write_file
+from utils.manifest import BuildManifest
+from utils.utils import generate_pages_recursive
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, 'content')
+        self.docs = os.path.join(self.root, 'docs')
+        self.template = os.path.join(self.root, 'template.html')
+        self.manifest_path = os.path.join(self.root, 'cache', 'manifest.json')
+
+        write_file(self.template, '<title>{{ Title }}</title>{{ Content }}')
+        write_file(os.path.join(self.content, 'index.md'), '# Home\n\nHello')
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# Post\n\nA post')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, basepath='/'):
+        manifest = BuildManifest(self.manifest_path)
+        generate_pages_recursive(self.content, self.template, self.docs, basepath, manifest)
+        manifest.remove_stale()
+        manifest.save()
+        return manifest
+
+    def test_first_build_renders_everything(self):
+        manifest = self.build()
+        self.assertEqual(manifest.rendered, 2)
+        self.assertEqual(manifest.skipped, 0)
+
+    def test_unchanged_build_skips_everything(self):
+        self.build()
+        manifest = self.build()
+        self.assertEqual(manifest.rendered, 0)
+        self.assertEqual(manifest.skipped, 2)
+
+    def test_changed_source_is_rerendered(self):
+        self.build()
+        write_file(os.path.join(self.content, 'blog', 'post.md'), '# Post\n\nEdited')
+        manifest = self.build()
+        self.assertEqual(manifest.rendered, 1)
+        with open(os.path.join(self.docs, 'blog', 'post.html')) as file:
+            self.assertIn('Edited', file.read())
+
+    def test_template_or_basepath_change_rerenders_all(self):
+        self.build()
+        self.assertEqual(self.build('/site/').rendered, 2)
+
+        write_file(self.template, '<h1>{{ Title }}</h1>{{ Content }}')
+        self.assertEqual(self.build('/site/').rendered, 2)
+
+    def test_missing_output_is_rerendered(self):
+        self.build()
+        os.remove(os.path.join(self.docs, 'index.html'))
+        self.assertEqual(self.build().rendered, 1)
+
+    def test_removed_source_deletes_output(self):
+        self.build()
+        shutil.rmtree(os.path.join(self.content, 'blog'))
+        manifest = BuildManifest(self.manifest_path)
+        generate_pages_recursive(self.content, self.template, self.docs, '/', manifest)
+        removed = manifest.remove_stale()
+
+        self.assertEqual(removed, [os.path.join(self.docs, 'blog', 'post.html')])
+        self.assertFalse(os.path.exists(os.path.join(self.docs, 'blog')))
+
+    def test_corrupt_manifest_is_ignored(self):
+        write_file(self.manifest_path, 'not json')
+        self.assertEqual(BuildManifest(self.manifest_path).pages, {})
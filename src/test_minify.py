@@ -0,0 +1,60 @@
+import unittest
+
+from minify import collapse_whitespace, minify_markup, minify_props
+from template import Template
+from utils.utils import markdown_to_html_chunks
+
+
+class TestMinify(unittest.TestCase):
+    def test_collapse_whitespace(self):
+        self.assertEqual(collapse_whitespace("a \n  b\tc"), "a b c")
+
+    def test_minify_markup_keeps_code(self):
+        html = "<body>\n  <p>a   b</p>\n  <code>x\n    y</code>\n</body>"
+        self.assertEqual(minify_markup(html), "<body><p>a b</p><code>x\n    y</code></body>")
+
+    def test_minify_markup_unclosed_element(self):
+        html = "<code>a   b\n  <pre>x\n  y</pre>\n</div>"
+        self.assertEqual(minify_markup(html), "<code>a b <pre>x\n  y</pre></div>")
+
+    def test_minify_markup_keeps_inline_spaces(self):
+        self.assertEqual(minify_markup("<b>a</b> <i>b</i>"), "<b>a</b> <i>b</i>")
+
+    def test_minify_props(self):
+        self.assertEqual(minify_props({'href': '/a/b', 'alt': 'two words'}), ' href=/a/b alt="two words"')
+        self.assertEqual(minify_props(None), '')
+
+    def test_minified_template(self):
+        template = Template('<head>\n    <link href="/a.css" />\n</head>\n<body>{{ Content }}</body>', '/b/', minify=True)
+        self.assertEqual(template.render(Content='x'), '<head><link href="/b/a.css" /></head><body>x</body>')
+
+
+class TestMinifiedRendering(unittest.TestCase):
+    def render(self, markdown, minify=True):
+        return ''.join(markdown_to_html_chunks(markdown.split('\n'), minify=minify))
+
+    def test_wrappers_dropped_except_paragraphs(self):
+        self.assertEqual(
+            self.render("## Title\n\nSome\ntext\n\n- a\n- b"),
+            "<div><h2>Title</h2><div>Some text</div><ul><li>a</li><li>b</li></ul></div>"
+        )
+
+    def test_code_preserved(self):
+        self.assertEqual(self.render("```\nx  =  1\n\n  y\n```"), "<div><code>\nx  =  1\n\n  y\n</code></div>")
+        self.assertEqual(self.render("run `a  b` now"), "<div><div>run <code>a  b</code> now</div></div>")
+
+    def test_links_and_images(self):
+        self.assertEqual(
+            self.render("[a\nlink](/x) ![alt](/i.png)"),
+            "<div><div><a href=/x>a link</a> <img src=/i.png alt=/i.png></div></div>"
+        )
+
+    def test_escaped(self):
+        self.assertEqual(
+            self.render("[a < b](/x?y&z) ![alt](/a b.png)"),
+            '<div><div><a href=/x?y&amp;z>a &lt; b</a> <img src="/a b.png" alt="/a b.png"></div></div>'
+        )
+
+    def test_smaller_than_plain(self):
+        markdown = "# T\n\n> quote\n> more\n\n1. one\n2. two"
+        self.assertLess(len(self.render(markdown)), len(self.render(markdown, minify=False)))
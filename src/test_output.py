@@ -0,0 +1,64 @@
+import os
+import stat
+import tempfile
+import unittest
+
+from utils.output import OutputWriter
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'page.html')
+        self.writer = OutputWriter()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path) as file:
+            return file.read()
+
+    def set_old_mtime(self):
+        os.utime(self.path, ns=(0, 1_000_000_000))
+
+    def test_write_new_file(self):
+        self.assertTrue(self.writer.write(self.path, '<p>é</p>'))
+        self.assertEqual(self.read(), '<p>é</p>')
+        self.assertEqual(os.listdir(self.tmp.name), ['page.html'])
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o666 & ~umask)
+
+    def test_identical_write_skipped(self):
+        self.writer.write(self.path, '<p>a</p>')
+        self.set_old_mtime()
+        self.assertFalse(self.writer.write(self.path, b'<p>a</p>'))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 1_000_000_000)
+        self.assertEqual((self.writer.written, self.writer.skipped), (1, 1))
+        self.assertEqual(os.listdir(self.tmp.name), ['page.html'])
+
+    def test_same_size_change_written(self):
+        self.writer.write(self.path, '<p>a</p>')
+        self.set_old_mtime()
+        self.assertTrue(self.writer.write(self.path, '<p>b</p>'))
+        self.assertEqual(self.read(), '<p>b</p>')
+        self.assertNotEqual(os.stat(self.path).st_mtime_ns, 1_000_000_000)
+
+    def test_streamed_chunks(self):
+        with self.writer.open(self.path) as file:
+            file.write('<p>')
+            file.writelines(['a', 'b'])
+            file.write('</p>')
+        self.assertEqual(self.read(), '<p>ab</p>')
+        self.assertTrue(file.changed)
+
+    def test_failed_write_keeps_old_output(self):
+        self.writer.write(self.path, '<p>old</p>')
+        with self.assertRaises(ValueError):
+            with self.writer.open(self.path) as file:
+                file.write('<p>trunc')
+                raise ValueError('render failed')
+        self.assertEqual(self.read(), '<p>old</p>')
+        self.assertEqual(os.listdir(self.tmp.name), ['page.html'])
+        self.assertEqual(self.writer.written, 1)
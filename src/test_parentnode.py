@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from leafnode import LeafNode
@@ -31,3 +32,26 @@ class TestParentNode(unittest.TestCase):
         
         with self.assertRaises(ValueError):
              parent_node.to_html()
+
+    def test_iter_html_matches_to_html(self):
+        parent_node = ParentNode("div", [LeafNode("b", "x"), ParentNode("p", [LeafNode(None, "y")])])
+        self.assertEqual(list(parent_node.iter_html()), ["<div>", "<b>x</b>", "<p>", "y", "</p>", "</div>"])
+        self.assertEqual(parent_node.to_html(), "<div><b>x</b><p>y</p></div>")
+
+    def test_write_html(self):
+        parent_node = ParentNode("ul", [ParentNode("li", [LeafNode(None, "one")])])
+        out = io.StringIO()
+        parent_node.write_html(out)
+        self.assertEqual(out.getvalue(), "<ul><li>one</li></ul>")
+
+    def test_deep_nesting(self):
+        node = LeafNode("b", "deep")
+        for _ in range(5000):
+            node = ParentNode("div", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<div>" * 5000 + "<b>deep</b>"))
+
+    def test_nested_no_children(self):
+        parent_node = ParentNode("div", [ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+             parent_node.to_html()
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import os
+import tempfile
+import threading
+import unittest
+
+from test_generate_pages import read_tree, write_file
+from utils.pipeline import DirectoryMaker, run_pipeline
+from utils.utils import collect_pages, generate_pages
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, 'content')
+        self.template = os.path.join(self.root, 'template.html')
+
+        write_file(self.template, '<title>{{ Title }}</title><a href="/x">{{ Content }}</a>')
+        for n in range(40):
+            write_file(os.path.join(self.content, f'dir{n % 5}', f'page{n}.md'), f'# Page {n}\n\nSome **bold** [link](/p{n})')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_pipeline_matches_serial(self):
+        serial = os.path.join(self.root, 'serial')
+        pipelined = os.path.join(self.root, 'pipelined')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(collect_pages(self.content, serial), self.template, '/base/')
+            errors = generate_pages(collect_pages(self.content, pipelined), self.template, '/base/', pipeline=True)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(read_tree(serial), read_tree(pipelined))
+
+    def test_errors_in_page_order(self):
+        pages = [(f'in{n}', os.path.join(self.root, 'out', f'{n}.html')) for n in range(3)]
+        pages.append(('missing', os.path.join(self.root, 'out', 'missing.html')))
+        for n in range(3):
+            write_file(f'{self.root}/in{n}', str(n))
+
+        def render(from_path, dest_path, markdown):
+            if markdown == '1':
+                raise ValueError('bad page')
+            return markdown
+
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            errors = run_pipeline(pages, render, readers=2, writers=3, queue_size=1, batch_size=2)
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual([from_path for from_path, _ in errors], ['in1', 'missing'])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.root, 'out'))), ['0.html', '2.html'])
+
+    def test_undecodable_and_unwritable_pages_fail_alone(self):
+        pages = [(os.path.join(self.root, f'in{n}'), os.path.join(self.root, 'out', f'{n}.html')) for n in range(4)]
+        for n in range(4):
+            write_file(pages[n][0], str(n))
+        with open(pages[1][0], 'wb') as file:
+            file.write(b'\xff\xfe not utf-8')
+
+        def render(from_path, dest_path, markdown):
+            # The writer cannot encode an int.
+            return 42 if markdown == '2' else markdown
+
+        result = []
+        thread = threading.Thread(target=lambda: result.append(run_pipeline(pages, render, readers=2, writers=2,
+                                                                            queue_size=1, batch_size=1)),
+                                  daemon=True)
+        thread.start()
+        thread.join(10)
+
+        self.assertFalse(thread.is_alive(), 'pipeline hung')
+        self.assertEqual([from_path for from_path, _ in result[0]], [pages[1][0], pages[2][0]])
+        self.assertIn('UnicodeDecodeError', result[0][0][1])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.root, 'out'))), ['0.html', '3.html'])
+
+    def test_directory_maker_creates_once(self):
+        maker = DirectoryMaker()
+        path = os.path.join(self.root, 'a', 'b')
+        maker.ensure(path)
+        maker.ensure(path)
+        self.assertTrue(os.path.isdir(path))
+        self.assertEqual(maker.created, {path})
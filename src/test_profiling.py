@@ -0,0 +1,93 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from test_generate_pages import write_file
+from utils import utils
+from utils.profiling import BuildProfiler
+from utils.render_cache import RenderCache
+from utils.utils import collect_pages, generate_page, generate_pages
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.template = os.path.join(self.root, 'template.html')
+        self.source = os.path.join(self.root, 'content', 'index.md')
+        write_file(self.template, '<title>{{ Title }}</title><link href="/a.css">{{ Content }}')
+        write_file(self.source, '# Home\n\nSome **bold** and a [link](/x)\n\n- a\n- b')
+
+        self.events = []
+        utils.profiler = BuildProfiler(hooks=[lambda event, data: self.events.append((event, data))])
+
+    def tearDown(self):
+        utils.profiler = None
+        self.tmp.cleanup()
+
+    def read(self, path):
+        with open(path) as file:
+            return file.read()
+
+    def test_profiled_page_matches_streamed_page(self):
+        profiled = os.path.join(self.root, 'profiled.html')
+        streamed = os.path.join(self.root, 'streamed.html')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page(self.source, self.template, profiled, '/base/')
+            utils.profiler = None
+            generate_page(self.source, self.template, streamed, '/base/')
+
+        self.assertEqual(self.read(profiled), self.read(streamed))
+
+    def test_page_record(self):
+        dest = os.path.join(self.root, 'out.html')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page(self.source, self.template, dest)
+
+        record = utils.profiler.pages[0]
+        self.assertEqual(record.bytes_read, os.path.getsize(self.source))
+        self.assertEqual(record.bytes_written, os.path.getsize(dest))
+        self.assertGreater(record.nodes, 5)
+        self.assertTrue({'read', 'blocks', 'inline', 'render', 'write'} <= set(record.stages))
+        self.assertEqual(self.events[0][0], 'page')
+
+    def test_report_and_hooks(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page(self.source, self.template, os.path.join(self.root, 'out.html'))
+        report = utils.profiler.report()
+
+        self.assertEqual(report['pages'], 1)
+        self.assertIn('render', report['stages_s'])
+        self.assertEqual(self.events[-1], ('build', report))
+
+    def test_parallel_records_reach_parent(self):
+        write_file(os.path.join(self.root, 'content', 'other.md'), '# Other\n\ntext')
+        pages = collect_pages(os.path.join(self.root, 'content'), os.path.join(self.root, 'docs'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(pages, self.template, '/', jobs=2)
+
+        self.assertEqual(len(utils.profiler.pages), 2)
+        self.assertEqual([event for event, _ in self.events], ['page', 'page'])
+
+    def test_profiled_pages_use_render_cache(self):
+        dest = os.path.join(self.root, 'out.html')
+        utils.render_cache = RenderCache(os.path.join(self.root, 'cache'))
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_page(self.source, self.template, dest)
+                generate_page(self.source, self.template, dest)
+            self.assertEqual((utils.render_cache.hits, utils.render_cache.misses), (1, 1))
+        finally:
+            utils.render_cache = None
+        self.assertEqual([record.bytes_written for record in utils.profiler.pages], [os.path.getsize(dest)] * 2)
+
+    def test_pipeline_ignored_with_warning(self):
+        pages = collect_pages(os.path.join(self.root, 'content'), os.path.join(self.root, 'docs'))
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            generate_pages(pages, self.template, '/', pipeline=True)
+
+        self.assertIn('Warning: pipeline ignored', log.getvalue())
+        self.assertEqual(len(utils.profiler.pages), 1)
@@ -0,0 +1,105 @@
+import os
+import stat
+import tempfile
+import unittest
+
+from test_generate_pages import read_tree, write_file
+from utils import utils
+from utils.render_cache import RenderCache, render_key
+from utils.utils import collect_pages, generate_pages
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.cache = RenderCache(os.path.join(self.root, 'cache'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_render_key(self):
+        key = render_key('# A', '<t>', '/')
+        self.assertEqual(key, render_key('# A', '<t>', '/'))
+        for other in (render_key('# B', '<t>', '/'), render_key('# A', '<u>', '/'), render_key('# A', '<t>', '/b/'),
+                      render_key('# A', '<t>', '/', minify=True), render_key('', '<t># A', '/')):
+            self.assertNotEqual(key, other)
+
+    def test_render_once(self):
+        calls = []
+        render = lambda: calls.append(1) or '<p>é</p>'
+        self.assertEqual(self.cache.render('ab' * 32, render), '<p>é</p>'.encode())
+        self.assertEqual(self.cache.render('ab' * 32, render), '<p>é</p>'.encode())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertTrue(os.path.isfile(os.path.join(self.root, 'cache', 'ab', 'ab' * 31 + '.html')))
+
+    def test_entries_readable_by_others(self):
+        self.cache.render('ef' * 32, lambda: 'page')
+        self.cache.save_stats()
+        umask = os.umask(0)
+        os.umask(umask)
+        for path in (self.cache.entry_path('ef' * 32), os.path.join(self.cache.directory, 'stats.json')):
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o666 & ~umask, path)
+
+    def test_cleanup_removes_least_recently_used(self):
+        keys = [f'{n:064x}' for n in range(5)]
+        for n, key in enumerate(keys):
+            self.cache.put(key, b'x' * 100)
+            os.utime(self.cache.entry_path(key), ns=(0, n * 1_000_000_000))
+        self.cache.get(keys[0])
+
+        self.cache.max_size = 350
+        self.assertEqual(self.cache.cleanup(), 2)
+        self.assertEqual([key for key in keys if os.path.exists(self.cache.entry_path(key))], [keys[0], keys[3], keys[4]])
+        self.assertEqual(self.cache.cleanup(), 0)
+
+    def test_stats(self):
+        self.cache.render('cd' * 32, lambda: 'page')
+        self.cache.render('cd' * 32, lambda: 'page')
+        self.cache.save_stats()
+        self.cache.save_stats()
+
+        stats = RenderCache(self.cache.directory).stats()
+        self.assertEqual((stats['entries'], stats['size'], stats['hits'], stats['misses']), (1, 4, 2, 2))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+
+class TestCachedBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.content = os.path.join(self.root, 'content')
+        self.template = os.path.join(self.root, 'template.html')
+        write_file(self.template, '<title>{{ Title }}</title><a href="/x">{{ Content }}</a>')
+        for n in range(4):
+            write_file(os.path.join(self.content, f'page{n}.md'), f'# Page {n}\n\nSome **bold** [link](/p{n})')
+        utils.render_cache = RenderCache(os.path.join(self.root, 'cache'))
+
+    def tearDown(self):
+        utils.render_cache = None
+        self.tmp.cleanup()
+
+    def build(self, name, **kwargs):
+        dest = os.path.join(self.root, name)
+        self.assertEqual(generate_pages(collect_pages(self.content, dest), self.template, '/base/', **kwargs), [])
+        return read_tree(dest)
+
+    def test_identical_inputs_not_rendered_again(self):
+        cache = utils.render_cache
+        utils.render_cache = None
+        uncached = self.build('plain')
+        utils.render_cache = cache
+
+        self.assertEqual(self.build('first'), uncached)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+        for kwargs in ({}, {'jobs': 2}, {'pipeline': True}):
+            self.assertEqual(self.build('again', **kwargs), uncached)
+        self.assertEqual((cache.hits, cache.misses), (12, 4))
+
+        write_file(self.template, '<h1>{{ Title }}</h1>{{ Content }}')
+        self.build('changed')
+        self.assertEqual(cache.misses, 8)
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from test_generate_pages import write_file
+from utils import utils
+from utils.manifest import BuildManifest
+from utils.search import SearchIndex
+from utils.utils import collect_pages, generate_pages, generate_pages_recursive
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, 'content')
+        self.docs = os.path.join(root, 'docs')
+        self.template = os.path.join(root, 'template.html')
+        self.state = os.path.join(root, 'cache', 'search.json')
+
+        write_file(self.template, '<title>{{ Title }}</title>{{ Content }}')
+        write_file(os.path.join(self.content, 'index.md'), '# Home Page\n\nWelcome to **Rivendell** and the [shire](/shire)')
+        write_file(os.path.join(self.content, 'blog', 'index.md'), '# Blog\n\n## Rivendell\n\n- elves of rivendell')
+
+    def tearDown(self):
+        utils.search_index = None
+        self.tmp.cleanup()
+
+    def build(self, jobs=1, pipeline=False):
+        utils.search_index = SearchIndex(self.docs, '/site/', self.state)
+        utils.search_index.load()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages(collect_pages(self.content, self.docs), self.template, '/site/', jobs, pipeline)
+        written = utils.search_index.write(os.path.join(self.docs, 'search'))
+        utils.search_index.save()
+        return written
+
+    def load(self, name):
+        with open(os.path.join(self.docs, 'search', name)) as file:
+            return json.load(file)
+
+    def test_index_files(self):
+        self.build()
+        pages = self.load('pages.json')
+        self.assertEqual(sorted(url for url, _ in pages.values()), ['/site/', '/site/blog/'])
+
+        ids = {url: int(page_id) for page_id, (url, _) in pages.items()}
+        postings = self.load('terms-ri.json')['rivendell']
+        self.assertEqual(postings, [[ids['/site/blog/'], 2], [ids['/site/'], 1]])
+        self.assertIn('shire', self.load('terms-sh.json'))
+        self.assertIn('home', self.load('terms-ho.json'))
+
+    def test_same_index_for_all_build_modes(self):
+        self.build()
+        serial = self.load('terms-ri.json')
+        for kwargs in ({'jobs': 2}, {'pipeline': True}):
+            os.remove(self.state)
+            self.build(**kwargs)
+            self.assertEqual(self.load('terms-ri.json'), serial, kwargs)
+
+    def test_unchanged_rebuild_writes_nothing(self):
+        self.build()
+        self.assertEqual(self.build(), [])
+
+    def test_removed_page_pruned(self):
+        self.build()
+        os.remove(os.path.join(self.docs, 'blog', 'index.html'))
+        utils.search_index = SearchIndex(self.docs, '/site/', self.state)
+        utils.search_index.load()
+        utils.search_index.write(os.path.join(self.docs, 'search'))
+
+        self.assertEqual([url for url, _ in self.load('pages.json').values()], ['/site/'])
+        self.assertFalse(os.path.exists(os.path.join(self.docs, 'search', 'terms-el.json')))
+
+    def test_incremental_build_indexes_skipped_pages(self):
+        manifest_path = os.path.join(self.tmp.name, 'cache', 'manifest.json')
+        manifest = BuildManifest(manifest_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(self.content, self.template, self.docs, '/site/', manifest)
+        manifest.save()
+
+        utils.search_index = SearchIndex(self.docs, '/site/', self.state)
+        manifest = BuildManifest(manifest_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(self.content, self.template, self.docs, '/site/', manifest)
+        self.assertEqual(manifest.rendered, 2)
+        self.assertEqual(sorted(utils.search_index.pages), ['/site/', '/site/blog/'])
+
+    def test_new_ids_follow_loaded_ids(self):
+        self.build()
+        index = SearchIndex(self.docs, '/site/', self.state)
+        index.load()
+        self.assertEqual(index.reserve(os.path.join(self.docs, 'new.html')), '/site/new.html')
+        self.assertEqual(index.ids['/site/new.html'], max(index.ids.values()))
+        self.assertEqual(len(set(index.ids.values())), 3)
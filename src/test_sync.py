@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from test_generate_pages import write_file
+from utils.sync import fast_copy, sync_dir_files
+
+
+class TestSync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, 'static')
+        self.dest = os.path.join(self.tmp.name, 'docs')
+        self.state = os.path.join(self.tmp.name, 'cache', 'static.json')
+
+        write_file(os.path.join(self.src, 'index.css'), 'body {}')
+        write_file(os.path.join(self.src, 'images', 'a.png'), 'png-bytes')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self):
+        return sync_dir_files(self.src, self.dest, jobs=2, state_path=self.state)
+
+    def test_first_sync_copies_everything(self):
+        copied, skipped, removed = self.sync()
+        self.assertEqual(copied, ['index.css', os.path.join('images', 'a.png')])
+        self.assertEqual((skipped, removed), ([], []))
+        with open(os.path.join(self.dest, 'images', 'a.png')) as file:
+            self.assertEqual(file.read(), 'png-bytes')
+
+    def test_unchanged_files_keep_mtime(self):
+        self.sync()
+        before = os.stat(os.path.join(self.dest, 'index.css')).st_mtime_ns
+        copied, skipped, _ = self.sync()
+        self.assertEqual(copied, [])
+        self.assertEqual(len(skipped), 2)
+        self.assertEqual(os.stat(os.path.join(self.dest, 'index.css')).st_mtime_ns, before)
+
+    def test_changed_file_is_copied(self):
+        self.sync()
+        write_file(os.path.join(self.src, 'index.css'), 'body { color: red }')
+        copied, _, _ = self.sync()
+        self.assertEqual(copied, ['index.css'])
+
+    def test_stale_files_removed_but_pages_kept(self):
+        self.sync()
+        write_file(os.path.join(self.dest, 'index.html'), '<html></html>')
+        os.remove(os.path.join(self.src, 'images', 'a.png'))
+
+        _, _, removed = self.sync()
+
+        self.assertEqual(removed, [os.path.join('images', 'a.png')])
+        self.assertFalse(os.path.exists(os.path.join(self.dest, 'images')))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, 'index.html')))
+
+    def test_fast_copy_replaces_hardlink(self):
+        src = os.path.join(self.src, 'index.css')
+        dest = os.path.join(self.tmp.name, 'linked.css')
+        fast_copy(src, dest, link=True)
+        self.assertEqual(os.stat(src).st_ino, os.stat(dest).st_ino)
+
+        fast_copy(src, dest)
+        self.assertNotEqual(os.stat(src).st_ino, os.stat(dest).st_ino)
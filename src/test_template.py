@@ -0,0 +1,63 @@
+import io
+import os
+import tempfile
+import unittest
+
+from template import Template, TemplateCache, rewrite_basepath
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_slots(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(template.render(Title='Hi', Content='<p>x</p>'), "<title>Hi</title><main><p>x</p></main>")
+
+    def test_repeated_and_unknown_slots(self):
+        template = Template("{{ Title }}|{{ Title }}|{{ Other }}")
+        self.assertEqual(template.render(Title='T'), "T|T|{{ Other }}")
+
+    def test_basepath_applied_to_fragments(self):
+        template = Template('<link href="/index.css"><img src="/a.png">{{ Content }}', '/site/')
+        self.assertEqual(template.fragments[0], '<link href="/site/index.css"><img src="/site/a.png">')
+        self.assertEqual(template.render(Content='<a href="/x">'), '<link href="/site/index.css"><img src="/site/a.png"><a href="/x">')
+
+    def test_write_streams_chunks(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        out = io.StringIO()
+        template.write(out, Title='Hi', Content=iter(['<p>', 'x', '</p>']))
+        self.assertEqual(out.getvalue(), "<title>Hi</title><main><p>x</p></main>")
+
+    def test_rewrite_basepath(self):
+        self.assertEqual(rewrite_basepath('<a href="/x"><img src="/y">', '/b/'), '<a href="/b/x"><img src="/b/y">')
+        self.assertEqual(rewrite_basepath('<a href="/x">', '/'), '<a href="/x">')
+
+
+class TestTemplateCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'template.html')
+        with open(self.path, 'w') as file:
+            file.write('<h1>{{ Title }}</h1>')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compiled_once(self):
+        cache = TemplateCache()
+        self.assertIs(cache.get(self.path), cache.get(self.path))
+        self.assertIsNot(cache.get(self.path), cache.get(self.path, '/other/'))
+
+    def test_named_templates(self):
+        cache = TemplateCache({'page': self.path})
+        self.assertEqual(cache.get('page').render(Title='A'), '<h1>A</h1>')
+
+    def test_detects_file_changes(self):
+        cache = TemplateCache()
+        first = cache.get(self.path)
+        with open(self.path, 'w') as file:
+            file.write('<h2>{{ Title }}</h2>!')
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+        second = cache.get(self.path)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.render(Title='A'), '<h2>A</h2>!')
@@ -26,6 +26,9 @@ class TestTextNode(unittest.TestCase):
     def test_url_is_set(self):
         node = TextNode("This is a text node", TextType.ITALIC, "https://www.boot.dev")
         self.assertEqual(node.url, "https://www.boot.dev")
+    def test_slots(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, '__dict__'))
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -4,7 +4,7 @@ from block_markdown import BlockType
 from htmlnode import HtmlNode
 from parentnode import ParentNode
 from textnode import TextNode, TextType
-from utils.utils import block_to_block_type, block_to_node, extract_markdown_images, extract_markdown_links, extract_title, get_heading_tag, get_paragraph_html, heading_type_block_to_html_node, markdown_to_blocks, split_nodes_delimiter, split_nodes_image, split_nodes_link, text_node_to_html_node, text_to_textnodes
+from utils.utils import block_to_block_type, block_to_node, extract_markdown_images, extract_markdown_links, extract_title, get_heading_tag, get_paragraph_html, heading_type_block_to_html_node, markdown_to_blocks, split_nodes_delimiter, split_nodes_image, split_nodes_link, text_node_to_html_node, text_to_textnodes, tokenize_inline
 
 
 class TestTextNode(unittest.TestCase):
@@ -44,6 +44,13 @@ class TestTextNode(unittest.TestCase):
         self.assertEqual(html_node.tag, 'img')
         self.assertEqual(html_node.props['src'], node.url)
 
+    def test_link_props_shared(self):
+        first = text_node_to_html_node(TextNode("a", TextType.LINK, '/same'))
+        second = text_node_to_html_node(TextNode("b", TextType.LINK, '/same'))
+        self.assertIs(first.props, second.props)
+        with self.assertRaises(TypeError):
+            first.props['href'] = '/other'
+
     def test_split_delimeter_not_text(self):
         node = TextNode("Test", TextType.IMAGE,'https://www.boot.dev/img/bootdev-logo-full-small.webp' )
         expected = [node]
@@ -148,6 +155,25 @@ class TestTextNode(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_links_many_links_no_recursion(self):
+        count = 5000
+        text = " ".join(f"[l{n}](/u{n})" for n in range(count))
+        new_nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+
+        self.assertEqual(len(new_nodes), 2 * count - 1)
+        self.assertEqual(new_nodes[-1], TextNode(f"l{count - 1}", TextType.LINK, f"/u{count - 1}"))
+
+    def test_split_images_repeated_image(self):
+        node = TextNode("![a](/a.png) then ![a](/a.png)", TextType.TEXT)
+        self.assertListEqual(
+            split_nodes_image([node]),
+            [
+                TextNode("a", TextType.IMAGE, "/a.png"),
+                TextNode(" then ", TextType.TEXT),
+                TextNode("a", TextType.IMAGE, "/a.png"),
+            ],
+        )
+
     def test_text_to_textnode(self):
         text = "This is **text** with an _italic_ word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
         node = text_to_textnodes(text)
@@ -193,6 +219,66 @@ class TestTextNode(unittest.TestCase):
         with self.assertRaises(ValueError):
              text_to_textnodes(2)
 
+    def test_tokenize_inline_matches_split_pipeline(self):
+        texts = [
+            "plain text",
+            "**bold** at start and `code` at end `x`",
+            "_a_ and **b** and `c` and ![i](/i.png) and [l](/l)",
+            "[first](/1)[second](/2)![third](/3)",
+            "**bold with `ticks`** and `code`",
+            "an image ![](/empty-alt.png) and a [](/empty-text) link",
+            "****empty bold and `` empty code",
+        ]
+        for text in texts:
+            nodes = [TextNode(text, TextType.TEXT)]
+            nodes = split_nodes_delimiter(nodes, '**', TextType.BOLD)
+            nodes = split_nodes_delimiter(nodes, '`', TextType.CODE)
+            nodes = split_nodes_delimiter(nodes, '_', TextType.ITALIC)
+            nodes = split_nodes_image(nodes)
+            nodes = split_nodes_link(nodes)
+            self.assertEqual(tokenize_inline(text), nodes, text)
+
+    def test_tokenize_inline_keeps_delimiters_in_links_literal(self):
+        # The split pipeline handled delimiters first and broke these apart.
+        self.assertEqual(tokenize_inline("[**x**](/u)"), [TextNode("**x**", TextType.LINK, "/u")])
+        self.assertEqual(
+            tokenize_inline("see [a](/x_y_z) ok"),
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("a", TextType.LINK, "/x_y_z"),
+                TextNode(" ok", TextType.TEXT),
+            ]
+        )
+        self.assertEqual(tokenize_inline("![a_b_c](/i.png)"), [TextNode("a_b_c", TextType.IMAGE, "/i.png")])
+
+    def test_tokenize_inline_nested_delimiters_are_literal(self):
+        self.assertEqual(tokenize_inline("`a**b**`"), [TextNode("a**b**", TextType.CODE)])
+        self.assertEqual(tokenize_inline("_a `b` c_"), [TextNode("a `b` c", TextType.ITALIC)])
+
+    def test_tokenize_inline_link_with_underscore(self):
+        self.assertEqual(
+            tokenize_inline("see [my_page](/a_b_c) now"),
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("my_page", TextType.LINK, "/a_b_c"),
+                TextNode(" now", TextType.TEXT),
+            ]
+        )
+
+    def test_tokenize_inline_code_is_literal(self):
+        self.assertEqual(
+            tokenize_inline("`**stars**` and **b**"),
+            [
+                TextNode("**stars**", TextType.CODE),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("b", TextType.BOLD),
+            ]
+        )
+
+    def test_tokenize_inline_unclosed(self):
+        with self.assertRaises(ValueError):
+            tokenize_inline("this **never closes")
+
     def test_markdown_to_blocks(self):
         md = """
 This is **bolded** paragraph
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from test_generate_pages import write_file
+from utils.walk import is_page, iter_pages, sorted_entries
+
+
+class TestWalk(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.content = self.tmp.name
+        for path in ('b.md', 'a/z.md', 'a/b/c.md', 'c/photo.png', 'drafts/wip.md', 'index.md', 'notes.txt'):
+            write_file(os.path.join(self.content, path), '# Page')
+        os.makedirs(os.path.join(self.content, 'empty'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def pages(self, **kwargs):
+        return [os.path.relpath(from_path, self.content).replace(os.sep, '/')
+                for from_path, _ in iter_pages(self.content, 'docs', **kwargs)]
+
+    def test_sorted_depth_first(self):
+        self.assertEqual(self.pages(), ['a/b/c.md', 'a/z.md', 'b.md', 'drafts/wip.md', 'index.md'])
+
+    def test_dest_paths(self):
+        pages = list(iter_pages(self.content, 'docs'))
+        self.assertEqual(pages[0], (os.path.join(self.content, 'a', 'b', 'c.md'), os.path.join('docs', 'a', 'b', 'c.html')))
+
+    def test_include_exclude(self):
+        self.assertEqual(self.pages(include=['a/*']), ['a/b/c.md', 'a/z.md'])
+        self.assertEqual(self.pages(exclude=['drafts', 'a/b/*']), ['a/z.md', 'b.md', 'index.md'])
+
+    def scanned(self, pages):
+        with patch('utils.walk.sorted_entries', wraps=sorted_entries) as entries:
+            pages()
+        return [os.path.relpath(call.args[0], self.content) for call in entries.call_args_list]
+
+    def test_excluded_directory_not_entered(self):
+        scanned = self.scanned(lambda: list(iter_pages(self.content, 'docs', exclude=['drafts'])))
+        self.assertNotIn('drafts', scanned)
+        self.assertIn('empty', scanned)
+
+    def test_lazy(self):
+        scanned = self.scanned(lambda: next(iter_pages(self.content, 'docs')))
+        self.assertEqual(scanned, ['.', 'a', os.path.join('a', 'b')])
+
+    def test_is_page(self):
+        self.assertTrue(is_page('blog/post.md'))
+        self.assertFalse(is_page('blog/post.png'))
+        self.assertFalse(is_page('blog/post.md', exclude=['blog/*']))
+        self.assertFalse(is_page('blog/post.md', include=['pages/*']))
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+from test_generate_pages import write_file
+from utils.watch import Watcher, page_dest_path
+
+
+def edit_file(path, text):
+    """write_file, with the mtime moved ahead so polling sees the change."""
+    write_file(path, text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, 'content')
+        self.static = os.path.join(root, 'static')
+        self.docs = os.path.join(root, 'docs')
+        self.template = os.path.join(root, 'template.html')
+
+        edit_file(self.template, '<title>{{ Title }}</title>{{ Content }}')
+        edit_file(os.path.join(self.content, 'index.md'), '# Home\n\nHello')
+        edit_file(os.path.join(self.content, 'blog', 'post.md'), '# Post\n\nA post')
+        edit_file(os.path.join(self.static, 'index.css'), 'body {}')
+
+        self.watcher = Watcher(self.content, self.template, self.static, self.docs)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_page_dest_path(self):
+        self.assertEqual(page_dest_path(os.path.join('content', 'blog', 'tom', 'index.md'), 'content', 'docs'),
+                         os.path.join('docs', 'blog', 'tom', 'index.html'))
+
+    def test_no_changes(self):
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_content_change_renders_one_page(self):
+        edit_file(os.path.join(self.content, 'blog', 'post.md'), '# Post\n\nEdited')
+        self.assertEqual(self.watcher.poll(), [os.path.join(self.docs, 'blog', 'post.html')])
+
+    def test_non_markdown_content_ignored(self):
+        edit_file(os.path.join(self.content, 'blog', 'photo.png'), 'png')
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_content_removed(self):
+        edit_file(os.path.join(self.content, 'blog', 'post.md'), '# Post\n\nEdited')
+        self.watcher.poll()
+        os.remove(os.path.join(self.content, 'blog', 'post.md'))
+        self.watcher.poll()
+        self.assertFalse(os.path.exists(os.path.join(self.docs, 'blog', 'post.html')))
+
+    def test_template_change_renders_all(self):
+        edit_file(self.template, '<h1>{{ Title }}</h1>{{ Content }}')
+        self.assertEqual(len(self.watcher.poll()), 2)
+        with open(os.path.join(self.docs, 'index.html')) as file:
+            self.assertTrue(file.read().startswith('<h1>Home</h1>'))
+
+    def test_static_change_copies_one_file(self):
+        edit_file(os.path.join(self.static, 'images', 'a.png'), 'png')
+        self.assertEqual(self.watcher.poll(), [os.path.join(self.docs, 'images', 'a.png')])
+
+    def test_drafts_skipped(self):
+        watcher = Watcher(self.content, self.template, self.static, self.docs, drafts=False)
+        post = os.path.join(self.content, 'blog', 'post.md')
+        output = os.path.join(self.docs, 'blog', 'post.html')
+        edit_file(post, '# Post\n\nPublished')
+        watcher.poll()
+        self.assertTrue(os.path.exists(output))
+
+        edit_file(post, '---\ndraft: true\n---\n# Post\n\nUnpublished')
+        self.assertEqual(watcher.poll(), [output])
+        self.assertFalse(os.path.exists(output))
+
+        edit_file(self.template, '<h1>{{ Title }}</h1>{{ Content }}')
+        watcher.poll()
+        self.assertFalse(os.path.exists(output))
+        self.assertTrue(os.path.exists(os.path.join(self.docs, 'index.html')))
@@ -14,6 +14,8 @@ class TextDelimeter(Enum):
     CODE = "`"
 
 class TextNode():
+    __slots__ = ('text', 'text_type', 'url')
+
     def __init__(self, text, text_type: TextType, url = None):
         self.text = text
         self.text_type = text_type
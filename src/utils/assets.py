@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+import re
+
+from utils.manifest import STATE_DIR
+from utils.output import OutputWriter
+from utils.sync import fast_copy
+
+ASSETS_STATE_PATH = os.path.join(STATE_DIR, 'assets.json')
+COMPRESSIBLE = ('.html', '.css', '.js', '.svg', '.json', '.xml', '.txt')
+REFERENCE_PATTERN = re.compile(r'(href|src)=("?)([^"\s>]*)\2')
+
+
+def content_hash(path, length=8):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+def fingerprinted_name(rel_path, digest):
+    path = Path(rel_path)
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}"))
+
+def load_asset_mapping(state_path=ASSETS_STATE_PATH):
+    """The mapping fingerprint_assets returned on its last run."""
+    try:
+        with open(state_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def fingerprint_assets(static_dir, dest_dir, state_path=ASSETS_STATE_PATH):
+    """Copies every static asset in dest_dir to a content-hashed name and
+    returns {original relative path: hashed relative path}.
+
+    The original is left in place so incremental syncs and references that
+    are not rewritten keep working. Hashed copies from a previous run whose
+    content changed since are removed.
+    """
+    mapping = {}
+    for dirpath, _, filenames in os.walk(static_dir):
+        for filename in filenames:
+            rel_path = os.path.relpath(os.path.join(dirpath, filename), static_dir)
+            hashed = fingerprinted_name(rel_path, content_hash(os.path.join(static_dir, rel_path)))
+            mapping[rel_path] = hashed
+
+            hashed_path = os.path.join(dest_dir, hashed)
+            if not os.path.exists(hashed_path):
+                fast_copy(os.path.join(dest_dir, rel_path), hashed_path, link=True)
+
+    previous = load_asset_mapping(state_path)
+    current = set(mapping.values())
+    for hashed in previous.values():
+        path = os.path.join(dest_dir, hashed)
+        if hashed not in current:
+            for stale in (path, path + '.gz'):
+                if os.path.isfile(stale):
+                    os.remove(stale)
+
+    dirs = os.path.dirname(state_path)
+    if dirs:
+        os.makedirs(dirs, exist_ok=True)
+    with open(state_path, 'w') as file:
+        json.dump(mapping, file, indent=1, sort_keys=True)
+
+    return mapping
+
+def rewrite_asset_references(html, mapping, basepath='/', previous=None):
+    """Points references to the original assets at their hashed names in
+    mapping. References to the hashed names in previous, left in pages an
+    incremental build did not render again, are moved on as well."""
+    urls = {basepath + rel_path.replace(os.sep, '/'): basepath + hashed.replace(os.sep, '/')
+            for rel_path, hashed in mapping.items()}
+    for rel_path, hashed in (previous or {}).items():
+        if rel_path in mapping and hashed != mapping[rel_path]:
+            urls[basepath + hashed.replace(os.sep, '/')] = basepath + mapping[rel_path].replace(os.sep, '/')
+
+    def replace(match):
+        url = urls.get(match.group(3))
+        if url is None:
+            return match.group(0)
+        return f'{match.group(1)}={match.group(2)}{url}{match.group(2)}'
+
+    return REFERENCE_PATTERN.sub(replace, html)
+
+def rewrite_pages(dest_dir, mapping, basepath='/', previous=None):
+    """Points every generated page at the hashed assets, see
+    rewrite_asset_references. Pages that already reference them are left
+    untouched, keeping their mtimes."""
+    rewritten = []
+    writer = OutputWriter()
+    for dirpath, _, filenames in os.walk(dest_dir):
+        for filename in filenames:
+            if not filename.endswith('.html'):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, 'r') as file:
+                html = file.read()
+            new_html = rewrite_asset_references(html, mapping, basepath, previous)
+            if new_html != html:
+                writer.write(path, new_html)
+                rewritten.append(path)
+    return rewritten
+
+def compress_file(path, level=9):
+    """Writes path.gz atomically and gives it the mtime of path, which
+    needs_compression compares against."""
+    stat = os.stat(path)
+    with open(path, 'rb') as file:
+        data = file.read()
+    # mtime=0 keeps the .gz bytes stable for unchanged input.
+    OutputWriter().write(path + '.gz', gzip.compress(data, compresslevel=level, mtime=0))
+    os.utime(path + '.gz', ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    return path
+
+def needs_compression(path):
+    # Any other mtime means path changed since, even when it was replaced
+    # by a copy that kept an older mtime.
+    try:
+        return os.stat(path + '.gz').st_mtime_ns != os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+def precompress(dest_dir, jobs=4, level=9):
+    """Writes .gz siblings for text outputs that changed since their last
+    compression, on a thread pool (zlib releases the GIL)."""
+    paths = []
+    for dirpath, _, filenames in os.walk(dest_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if filename.endswith(COMPRESSIBLE) and needs_compression(path):
+                paths.append(path)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        return sorted(pool.map(lambda path: compress_file(path, level), paths))
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+
+from utils.manifest import GENERATOR_VERSION, STATE_DIR
+
+BLOCK_CACHE_PATH = os.path.join(STATE_DIR, 'blocks.json')
+
+
+def block_key(block):
+    return hashlib.blake2b(block.encode(), digest_size=16).hexdigest()
+
+
+class BlockCache():
+    """LRU cache of rendered block html keyed by a hash of the block text."""
+
+    def __init__(self, maxsize=4096, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Set to a list to collect the (key, html) entries added, e.g. to
+        # hand them from a pool worker back to the parent's cache.
+        self.added = None
+
+    def get(self, block, variant=''):
+        key = block_key(variant + block)
+        html = self.entries.get(key)
+        if html is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return html
+
+    def put(self, block, html, variant=''):
+        self.add(block_key(variant + block), html)
+
+    def add(self, key, html):
+        if self.maxsize <= 0:
+            return
+        self.entries[key] = html
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        if self.added is not None:
+            self.added.append((key, html))
+
+    def render(self, block, render_block, variant=''):
+        """Returns the cached html for block, rendering it on a miss. The
+        variant separates renderings of the same text, e.g. minified."""
+        html = self.get(block, variant)
+        if html is None:
+            html = render_block(block)
+            self.put(block, html, variant)
+        return html
+
+    def load(self):
+        if self.path is None or self.maxsize <= 0:
+            return
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != GENERATOR_VERSION:
+            return
+        for key, html in data.get('entries', [])[-self.maxsize:]:
+            self.entries[key] = html
+
+    def save(self):
+        if self.path is None:
+            return
+        dirs = os.path.dirname(self.path)
+        if dirs:
+            os.makedirs(dirs, exist_ok=True)
+        with open(self.path, 'w') as file:
+            json.dump({'version': GENERATOR_VERSION, 'entries': list(self.entries.items())}, file)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"BlockCache({len(self.entries)}/{self.maxsize}, hits={self.hits}, misses={self.misses})"
@@ -0,0 +1,163 @@
+import io
+import json
+import os
+import re
+
+from utils.manifest import GENERATOR_VERSION, STATE_DIR
+
+METADATA_CACHE_PATH = os.path.join(STATE_DIR, 'metadata.json')
+FENCE = '---'
+FIELD_PATTERN = re.compile(r"([A-Za-z_][\w-]*)\s*:\s*(.*)")
+TITLE_PATTERN = re.compile(r"# (.+)")
+TRUE_VALUES = ('true', 'yes', 'on', '1')
+
+
+class PageMeta():
+    """Front matter of a page. Fields other than title, date, tags and
+    draft are kept as strings in extra."""
+    __slots__ = ('title', 'date', 'tags', 'draft', 'extra')
+
+    def __init__(self, title=None, date=None, tags=(), draft=False, extra=None):
+        self.title = title
+        self.date = date
+        self.tags = list(tags)
+        self.draft = draft
+        self.extra = extra or {}
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return isinstance(other, PageMeta) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"PageMeta({self.title!r}, {self.date!r}, {self.tags!r}, {self.draft!r}, {self.extra!r})"
+
+
+def unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    return value
+
+def parse_tags(value):
+    """Accepts "a, b" as well as "[a, b]"."""
+    if value.startswith('[') and value.endswith(']'):
+        value = value[1:-1]
+    return [unquote(tag.strip()) for tag in value.split(',') if tag.strip()]
+
+def parse_fields(lines):
+    """Builds a PageMeta from the "key: value" lines between the fences.
+    Blank lines and # comments are ignored, as are lines without a key."""
+    meta = PageMeta()
+    for line in lines:
+        line = line.strip()
+        match = FIELD_PATTERN.fullmatch(line)
+        if not line or line.startswith('#') or match is None:
+            continue
+        key, value = match.group(1).lower(), match.group(2).strip()
+        match key:
+            case 'title':
+                meta.title = unquote(value)
+            case 'date':
+                meta.date = unquote(value)
+            case 'tags':
+                meta.tags = parse_tags(value)
+            case 'draft':
+                meta.draft = unquote(value).lower() in TRUE_VALUES
+            case _:
+                meta.extra[key] = unquote(value)
+    return meta
+
+def read_header(file):
+    """Reads the front matter and the first body line from an open file,
+    leaving the file positioned after them.
+
+    Returns (PageMeta, first_line). Pages without front matter get an
+    empty PageMeta and their first line. The title falls back to a
+    "# Title" first body line, as extract_title expects.
+    """
+    first_line = file.readline()
+    if first_line.rstrip() != FENCE:
+        meta = PageMeta()
+    else:
+        fields = []
+        for line in file:
+            if line.rstrip() == FENCE:
+                break
+            fields.append(line)
+        else:
+            raise ValueError('Front matter is not closed.')
+        meta = parse_fields(fields)
+        first_line = file.readline()
+        while first_line and not first_line.strip():
+            first_line = file.readline()
+
+    if meta.title is None:
+        match = TITLE_PATTERN.match(first_line)
+        if match is not None:
+            meta.title = match.group(1).strip()
+    return meta, first_line
+
+def split_front_matter(markdown):
+    """Returns (PageMeta, body) for a whole page held in memory."""
+    if not markdown.startswith(FENCE):
+        return read_header(io.StringIO(markdown))[0], markdown
+    file = io.StringIO(markdown)
+    meta, first_line = read_header(file)
+    return meta, first_line + file.read()
+
+def read_page_meta(path):
+    with open(path, 'r') as file:
+        meta, _ = read_header(file)
+    return meta
+
+
+class MetadataCache():
+    """Front matter by source path, re-read only when the file's mtime or
+    size changes. Optionally kept in a JSON file between builds."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.reads = 0
+
+    def get(self, source_path):
+        stat = os.stat(source_path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        cached = self.entries.get(source_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        meta = read_page_meta(source_path)
+        self.reads += 1
+        self.entries[source_path] = (signature, meta)
+        return meta
+
+    def scan(self, source_paths):
+        """Yields (source_path, PageMeta) pairs, e.g. to build tag listings
+        or index pages without rendering any page."""
+        for source_path in source_paths:
+            yield source_path, self.get(source_path)
+
+    def load(self):
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != GENERATOR_VERSION:
+            return
+        for source_path, (signature, fields) in data.get('entries', {}).items():
+            self.entries[source_path] = (signature, PageMeta(**fields))
+
+    def save(self):
+        if self.path is None:
+            return
+        dirs = os.path.dirname(self.path)
+        if dirs:
+            os.makedirs(dirs, exist_ok=True)
+        entries = {source_path: (signature, meta.to_dict()) for source_path, (signature, meta) in self.entries.items()
+                   if os.path.exists(source_path)}
+        with open(self.path, 'w') as file:
+            json.dump({'version': GENERATOR_VERSION, 'entries': entries}, file)
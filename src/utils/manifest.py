@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+
+GENERATOR_VERSION = '2'
+# Directory of the files kept between builds.
+STATE_DIR = '.build_cache'
+MANIFEST_PATH = os.path.join(STATE_DIR, 'manifest.json')
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest():
+    """Remembers the inputs each output page was rendered from.
+
+    Pages whose source hash, template hash, basepath and generator version
+    are unchanged since the last build can be skipped, and outputs whose
+    source disappeared can be removed. Once every page was walked
+    (complete), outputs of pages left out of the build, e.g. drafts or
+    excluded pages, are removed too.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.pages = self.load()
+        self.seen = {}
+        self.rendered = 0
+        self.skipped = 0
+        self.complete = False
+        self._template_hashes = {}
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get('version') != GENERATOR_VERSION:
+            return {}
+
+        return data.get('pages', {})
+
+    def save(self):
+        dirs = os.path.dirname(self.path)
+        if dirs:
+            os.makedirs(dirs, exist_ok=True)
+
+        with open(self.path, 'w') as file:
+            json.dump({'version': GENERATOR_VERSION, 'pages': self.seen}, file, indent=1, sort_keys=True)
+
+    def fingerprint(self, source_path, template_path, basepath, minify=False):
+        if template_path not in self._template_hashes:
+            self._template_hashes[template_path] = hash_file(template_path)
+
+        return {
+            'source': source_path,
+            'source_hash': hash_file(source_path),
+            'template_hash': self._template_hashes[template_path],
+            'basepath': basepath,
+            'minify': minify,
+            'generator': GENERATOR_VERSION,
+        }
+
+    def is_fresh(self, dest_path, fingerprint):
+        return self.pages.get(dest_path) == fingerprint and os.path.isfile(dest_path)
+
+    def record(self, dest_path, fingerprint, rendered=True):
+        self.seen[dest_path] = fingerprint
+        if rendered:
+            self.rendered += 1
+        else:
+            self.skipped += 1
+
+    def keep(self, dest_path):
+        """Leaves the previous output of a page that failed in place."""
+        if dest_path in self.pages:
+            self.seen[dest_path] = self.pages[dest_path]
+
+    def remove_stale(self):
+        removed = []
+        for dest_path, fingerprint in self.pages.items():
+            if dest_path in self.seen or (not self.complete and os.path.exists(fingerprint['source'])):
+                continue
+            if os.path.isfile(dest_path):
+                os.remove(dest_path)
+                removed.append(dest_path)
+                remove_empty_dirs(os.path.dirname(dest_path))
+        return removed
+
+
+def remove_empty_dirs(path):
+    while path:
+        try:
+            os.rmdir(path)
+        except OSError:
+            return
+        path = os.path.dirname(path)
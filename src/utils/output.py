@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+import hashlib
+import os
+import secrets
+import threading
+
+
+def same_content(path, size, digest):
+    """Whether the file at path holds size bytes hashing to digest. The
+    size is checked first, so most changed files are never read."""
+    try:
+        if os.stat(path).st_size != size:
+            return False
+        existing = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(65536), b''):
+                existing.update(chunk)
+    except OSError:
+        return False
+    return existing.digest() == digest
+
+
+def create_temp(path):
+    """Creates a new temporary file next to path and returns (fd, name).
+    Unlike mkstemp, the file gets the permissions a plain open() would
+    give the output, since the process umask applies to the 0o666 mode."""
+    dirs, name = os.path.split(path)
+    while True:
+        temp_path = os.path.join(dirs, f'.{name}.{secrets.token_hex(4)}.tmp')
+        try:
+            return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+class HashingFile():
+    """Text file wrapper that encodes, hashes and counts what is written."""
+
+    def __init__(self, file):
+        self.file = file
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.changed = None
+
+    def write(self, text):
+        data = text.encode() if type(text) is str else text
+        self.digest.update(data)
+        self.size += len(data)
+        self.file.write(data)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+
+class OutputWriter():
+    """Writes build outputs atomically, leaving identical files untouched.
+
+    Content goes to a temporary file next to the output, hashed as it is
+    written. If the existing output has the same size and hash the
+    temporary file is dropped, so the output keeps its mtime; otherwise it
+    is renamed over the output. A failed or interrupted write never leaves
+    a truncated output behind. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self.written = 0
+        self.skipped = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def open(self, path):
+        """Yields a file to write str or bytes chunks of path to; the
+        output is replaced when the block exits without an exception."""
+        fd, temp_path = create_temp(path)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pending = HashingFile(file)
+                yield pending
+            pending.changed = self.commit(temp_path, path, pending.size, pending.digest.digest())
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def commit(self, temp_path, path, size, digest):
+        if same_content(path, size, digest):
+            os.remove(temp_path)
+            self.count(skipped=1)
+            return False
+        os.replace(temp_path, path)
+        self.count(written=1)
+        return True
+
+    def write(self, path, data):
+        """Writes str or bytes data to path. Returns whether the file
+        changed."""
+        with self.open(path) as file:
+            file.write(data)
+        return file.changed
+
+    def count(self, written=0, skipped=0):
+        with self.lock:
+            self.written += written
+            self.skipped += skipped
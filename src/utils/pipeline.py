@@ -0,0 +1,116 @@
+import os
+import queue
+import threading
+
+from utils.output import OutputWriter
+
+_DONE = object()
+
+
+class DirectoryMaker():
+    """Creates each output directory once, however many pages share it."""
+
+    def __init__(self):
+        self.created = set()
+        self.lock = threading.Lock()
+
+    def ensure(self, path):
+        if not path or path in self.created:
+            return
+        with self.lock:
+            if path not in self.created:
+                os.makedirs(path, exist_ok=True)
+                self.created.add(path)
+
+
+def run_pipeline(pages, render, readers=4, writers=4, queue_size=32, batch_size=8, writer: OutputWriter = None):
+    """Reads, renders and writes (from_path, dest_path) pages with the
+    stages overlapped.
+
+    Reader threads prefetch sources into a bounded queue, render(from_path,
+    markdown) runs on the calling thread, and writer threads drain a bounded
+    queue in batches through writer, which skips unchanged pages. Returns
+    the failed pages as (from_path, error) in page order.
+    """
+    writer = writer if writer is not None else OutputWriter()
+    jobs = queue.Queue()
+    sources = queue.Queue(maxsize=queue_size)
+    outputs = queue.Queue(maxsize=queue_size)
+    directories = DirectoryMaker()
+    errors = {}
+    errors_lock = threading.Lock()
+
+    def fail(from_path, e):
+        with errors_lock:
+            errors[from_path] = f"{type(e).__name__}: {e}"
+
+    def read_sources():
+        # _DONE is posted however the thread ends, or the main loop would
+        # wait for it forever.
+        try:
+            while True:
+                page = jobs.get()
+                if page is _DONE:
+                    return
+                from_path, dest_path = page
+                try:
+                    with open(from_path, 'r') as file:
+                        sources.put((from_path, dest_path, file.read()))
+                except Exception as e:
+                    fail(from_path, e)
+        finally:
+            sources.put(_DONE)
+
+    def write_outputs():
+        while True:
+            batch = []
+            item = outputs.get()
+            while item is not _DONE:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+                try:
+                    item = outputs.get_nowait()
+                except queue.Empty:
+                    break
+
+            for from_path, dest_path, html in batch:
+                try:
+                    directories.ensure(os.path.dirname(dest_path))
+                    writer.write(dest_path, html)
+                except Exception as e:
+                    # A writer that stopped would leave the bounded queue
+                    # full and the main loop blocked.
+                    fail(from_path, e)
+
+            if item is _DONE:
+                return
+
+    for page in pages:
+        jobs.put(page)
+    for _ in range(readers):
+        jobs.put(_DONE)
+
+    threads = [threading.Thread(target=read_sources, daemon=True) for _ in range(readers)]
+    threads += [threading.Thread(target=write_outputs, daemon=True) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+
+    finished_readers = 0
+    while finished_readers < readers:
+        item = sources.get()
+        if item is _DONE:
+            finished_readers += 1
+            continue
+        from_path, dest_path, markdown = item
+        try:
+            outputs.put((from_path, dest_path, render(from_path, dest_path, markdown)))
+        except Exception as e:
+            fail(from_path, e)
+
+    for _ in range(writers):
+        outputs.put(_DONE)
+    for thread in threads:
+        thread.join()
+
+    return [(from_path, errors[from_path]) for from_path, _ in pages if from_path in errors]
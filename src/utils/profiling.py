@@ -0,0 +1,106 @@
+from contextlib import contextmanager
+import json
+import time
+
+
+class PageRecord():
+    __slots__ = ('from_path', 'dest_path', 'wall_s', 'stages', 'bytes_read', 'bytes_written', 'nodes')
+
+    def __init__(self, from_path, dest_path):
+        self.from_path = from_path
+        self.dest_path = dest_path
+        self.wall_s = 0.0
+        self.stages = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.nodes = 0
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class BuildProfiler():
+    """Collects wall time per stage and per page, bytes read and written and
+    node counts for a build.
+
+    Hooks are callables taking (event, data): ('page', PageRecord dict) when
+    a page finishes and ('build', report dict) when report() is called, so
+    the numbers can be forwarded to another metrics system.
+    """
+
+    def __init__(self, hooks=None):
+        self.hooks = list(hooks or [])
+        self.pages = []
+        self.stages = {}
+        self.current = None
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            stages = self.current.stages if self.current is not None else self.stages
+            stages[name] = stages.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def page(self, from_path, dest_path):
+        record = PageRecord(from_path, dest_path)
+        self.current = record
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_s = time.perf_counter() - started
+            self.current = None
+            self.add(record)
+
+    def add(self, record):
+        self.pages.append(record)
+        for hook in self.hooks:
+            hook('page', record.to_dict())
+
+    def slowest(self, count=10):
+        return sorted(self.pages, key=lambda record: record.wall_s, reverse=True)[:count]
+
+    def report(self):
+        stages = dict(self.stages)
+        for record in self.pages:
+            for name, elapsed in record.stages.items():
+                stages[name] = stages.get(name, 0.0) + elapsed
+
+        report = {
+            'wall_s': time.perf_counter() - self.started,
+            'pages': len(self.pages),
+            'stages_s': stages,
+            'bytes_read': sum(record.bytes_read for record in self.pages),
+            'bytes_written': sum(record.bytes_written for record in self.pages),
+            'nodes': sum(record.nodes for record in self.pages),
+            'page_records': [record.to_dict() for record in self.pages],
+        }
+        for hook in self.hooks:
+            hook('build', report)
+        return report
+
+    def write_report(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.report(), file, indent=1)
+
+    def print_slowest(self, count=10):
+        print(f"\nSlowest {min(count, len(self.pages))} of {len(self.pages)} pages:")
+        for record in self.slowest(count):
+            stages = ', '.join(f"{name} {elapsed * 1000:.1f}" for name, elapsed in sorted(record.stages.items()))
+            print(f"  {record.wall_s * 1000:8.1f} ms  {record.from_path}  ({stages})")
+
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.children:
+            stack.extend(node.children)
+    return count
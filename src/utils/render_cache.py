@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+
+from utils.manifest import GENERATOR_VERSION
+from utils.output import create_temp
+
+RENDER_CACHE_ENV = 'RENDER_CACHE_DIR'
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+# Cleaning up stops at this fraction of max_size, so a full cache is not
+# cleaned again on the very next build.
+CLEANUP_TARGET = 0.9
+STATS_FILE = 'stats.json'
+
+
+def render_key(source, template, basepath, minify=False):
+    """Digest of everything a rendered page depends on. source and template
+    are the texts; lengths are hashed too so fields cannot run together."""
+    digest = hashlib.sha256()
+    for part in (GENERATOR_VERSION.encode(), basepath.encode(), b'1' if minify else b'0',
+                 template.encode(), source.encode()):
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class RenderCache():
+    """Content-addressed cache of rendered pages in a directory, like ccache.
+
+    Entries live at <directory>/<key[:2]>/<key[2:]>.html and are written
+    through a temporary file and a rename, so several builds, worktrees or
+    CI jobs can share the directory, and it can be saved and restored as a
+    CI cache. Hits refresh the entry mtime; cleanup() removes the least
+    recently used entries once the directory grows past max_size bytes.
+    Hit and miss counts of every build are added up in stats.json; builds
+    that save their counts at the same moment may lose one another's.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._templates = {}
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key[:2], key[2:] + '.html')
+
+    def template_text(self, template_path):
+        """The template text, re-read only when the file changes."""
+        stat = os.stat(template_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._templates.get(template_path)
+        if cached is None or cached[0] != signature:
+            with open(template_path, 'r') as file:
+                cached = (signature, file.read())
+            self._templates[template_path] = cached
+        return cached[1]
+
+    def key(self, source, template_path, basepath, minify=False):
+        return render_key(source, self.template_text(template_path), basepath, minify)
+
+    def get(self, key):
+        path = self.entry_path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            os.utime(path)
+        except OSError:
+            self.count(misses=1)
+            return None
+        self.count(hits=1)
+        return data
+
+    def put(self, key, data):
+        path = self.entry_path(key)
+        dirs = os.path.dirname(path)
+        os.makedirs(dirs, exist_ok=True)
+        fd, temp_path = create_temp(path)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def render(self, key, render_page):
+        """Returns the cached page bytes for key, calling render_page() for
+        the html on a miss and storing it."""
+        data = self.get(key)
+        if data is None:
+            data = render_page().encode()
+            self.put(key, data)
+        return data
+
+    def count(self, hits=0, misses=0):
+        with self.lock:
+            self.hits += hits
+            self.misses += misses
+
+    def entries(self):
+        """Yields (path, size, mtime_ns) for every entry."""
+        try:
+            shards = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            with os.scandir(shard.path) as files:
+                for entry in files:
+                    if entry.name.endswith('.html'):
+                        stat = entry.stat()
+                        yield entry.path, stat.st_size, stat.st_mtime_ns
+
+    def cleanup(self):
+        """Removes least recently used entries until the cache fits in
+        CLEANUP_TARGET of max_size. Returns the number removed."""
+        entries = list(self.entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        if size <= self.max_size:
+            return 0
+        removed = 0
+        for path, entry_size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if size <= self.max_size * CLEANUP_TARGET:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+            removed += 1
+        return removed
+
+    def load_stats(self):
+        try:
+            with open(os.path.join(self.directory, STATS_FILE), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {'hits': 0, 'misses': 0}
+
+    def save_stats(self):
+        """Adds this build's hits and misses to the cumulative counts."""
+        totals = self.load_stats()
+        totals['hits'] = totals.get('hits', 0) + self.hits
+        totals['misses'] = totals.get('misses', 0) + self.misses
+        os.makedirs(self.directory, exist_ok=True)
+        stats_path = os.path.join(self.directory, STATS_FILE)
+        fd, temp_path = create_temp(stats_path)
+        with os.fdopen(fd, 'w') as file:
+            json.dump(totals, file)
+        os.replace(temp_path, stats_path)
+
+    def stats(self):
+        sizes = [entry_size for _, entry_size, _ in self.entries()]
+        totals = self.load_stats()
+        lookups = totals.get('hits', 0) + totals.get('misses', 0)
+        return {
+            'directory': self.directory,
+            'entries': len(sizes),
+            'size': sum(sizes),
+            'max_size': self.max_size,
+            'hits': totals.get('hits', 0),
+            'misses': totals.get('misses', 0),
+            'hit_rate': totals.get('hits', 0) / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        for path, _, _ in list(self.entries()):
+            os.remove(path)
+        stats_path = os.path.join(self.directory, STATS_FILE)
+        if os.path.exists(stats_path):
+            os.remove(stats_path)
@@ -0,0 +1,138 @@
+from collections import Counter
+import json
+import os
+import re
+
+from textnode import TextType
+from utils.manifest import STATE_DIR
+from utils.output import OutputWriter
+
+SEARCH_STATE_PATH = os.path.join(STATE_DIR, 'search.json')
+TERM_PATTERN = re.compile(r"\w\w+")
+TITLE_WEIGHT = 5
+SHARD_PREFIX_LENGTH = 2
+INDEXED_TYPES = (TextType.TEXT, TextType.BOLD, TextType.ITALIC, TextType.CODE, TextType.LINK, TextType.IMAGE)
+
+
+def shard_name(term):
+    return term[:SHARD_PREFIX_LENGTH]
+
+
+class SearchIndex():
+    """Inverted index of page terms, filled while pages are rendered.
+
+    Pages keep stable numeric ids across builds and their terms are kept in
+    a state file, so an incremental build only re-indexes the pages it
+    re-renders. write() emits pages.json plus one shard per term prefix,
+    rewriting only shards whose content changed.
+    """
+
+    def __init__(self, dest_dir, basepath='/', state_path=SEARCH_STATE_PATH):
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.state_path = state_path
+        self.ids = {}
+        self.next_id = 0
+        self.pages = {}
+        self.updated = []
+        self.current = None
+
+    def load(self):
+        try:
+            with open(self.state_path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        self.ids = data.get('ids', {})
+        self.next_id = max(self.ids.values(), default=-1) + 1
+        self.pages = data.get('pages', {})
+
+    def save(self):
+        dirs = os.path.dirname(self.state_path)
+        if dirs:
+            os.makedirs(dirs, exist_ok=True)
+        with open(self.state_path, 'w') as file:
+            json.dump({'ids': self.ids, 'pages': self.pages}, file)
+
+    def page_url(self, dest_path):
+        url = os.path.relpath(dest_path, self.dest_dir).replace(os.sep, '/')
+        if url == 'index.html':
+            url = ''
+        elif url.endswith('/index.html'):
+            url = url[:-len('index.html')]
+        return self.basepath + url
+
+    def begin_page(self):
+        self.current = []
+
+    def collect(self, text_nodes):
+        if self.current is None:
+            return
+        for node in text_nodes:
+            if node.text and node.text_type in INDEXED_TYPES:
+                self.current.append(node.text)
+
+    def end_page(self, dest_path, title):
+        terms = Counter(TERM_PATTERN.findall(' '.join(self.current).lower()))
+        for term in TERM_PATTERN.findall(title.lower()):
+            terms[term] += TITLE_WEIGHT
+        self.current = None
+        self.set_page(dest_path, {'title': title, 'terms': dict(terms)})
+
+    def reserve(self, dest_path):
+        """Gives the page an id now, so ids follow page order even when
+        pages finish rendering out of order."""
+        url = self.page_url(dest_path)
+        if url not in self.ids:
+            self.ids[url] = self.next_id
+            self.next_id += 1
+        return url
+
+    def has_page(self, dest_path):
+        return self.page_url(dest_path) in self.pages
+
+    def set_page(self, dest_path, entry):
+        url = self.reserve(dest_path)
+        entry['dest'] = dest_path
+        self.pages[url] = entry
+        self.updated.append((dest_path, entry))
+
+    def prune(self):
+        for url in [url for url, entry in self.pages.items() if not os.path.isfile(entry['dest'])]:
+            del self.pages[url]
+            del self.ids[url]
+
+    def shards(self):
+        shards = {}
+        for url, entry in self.pages.items():
+            page_id = self.ids[url]
+            for term, weight in entry['terms'].items():
+                shards.setdefault(shard_name(term), {}).setdefault(term, []).append([page_id, weight])
+        for shard in shards.values():
+            for postings in shard.values():
+                postings.sort(key=lambda posting: (-posting[1], posting[0]))
+        return shards
+
+    def write(self, index_dir):
+        """Writes the index files and returns the paths that changed."""
+        self.prune()
+        os.makedirs(index_dir, exist_ok=True)
+        files = {
+            'pages.json': {str(self.ids[url]): [url, entry['title']] for url, entry in self.pages.items()},
+        }
+        for name, shard in self.shards().items():
+            files[f'terms-{name}.json'] = shard
+
+        written = []
+        writer = OutputWriter()
+        for name, data in sorted(files.items()):
+            path = os.path.join(index_dir, name)
+            if writer.write(path, json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)):
+                written.append(path)
+
+        for name in os.listdir(index_dir):
+            if name.startswith('terms-') and name not in files:
+                os.remove(os.path.join(index_dir, name))
+                written.append(os.path.join(index_dir, name))
+
+        return written
@@ -0,0 +1,120 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import shutil
+
+from utils.manifest import STATE_DIR, remove_empty_dirs
+
+SYNC_STATE_PATH = os.path.join(STATE_DIR, 'static.json')
+
+# ioctl request number for FICLONE (Linux reflink).
+FICLONE = 0x40049409
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def reflink_file(src, dest):
+    if fcntl is None:
+        return False
+    with open(src, 'rb') as src_file, open(dest, 'wb') as dest_file:
+        try:
+            fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+        except OSError:
+            return False
+    return True
+
+def copy_range_file(src, dest):
+    if not hasattr(os, 'copy_file_range'):
+        return False
+    with open(src, 'rb') as src_file, open(dest, 'wb') as dest_file:
+        remaining = os.fstat(src_file.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(src_file.fileno(), dest_file.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError:
+            return False
+    return remaining == 0
+
+def fast_copy(src, dest, link=False):
+    """Copies src to dest with the cheapest method available.
+
+    Tries a hardlink (only when link is set, since the output then shares
+    the source inode), a reflink, copy_file_range and finally shutil.
+    The source mtime is kept so later syncs can skip the file.
+    """
+    if os.path.lexists(dest):
+        os.remove(dest)
+
+    if link:
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+
+    if not reflink_file(src, dest) and not copy_range_file(src, dest):
+        shutil.copyfile(src, dest)
+
+    shutil.copystat(src, dest)
+
+def is_unchanged(src, dest):
+    try:
+        dest_stat = os.stat(dest)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src)
+    return src_stat.st_size == dest_stat.st_size and src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+def load_synced_files(state_path):
+    try:
+        with open(state_path, 'r') as file:
+            return set(json.load(file))
+    except (OSError, ValueError):
+        return set()
+
+def save_synced_files(state_path, files):
+    dirs = os.path.dirname(state_path)
+    if dirs:
+        os.makedirs(dirs, exist_ok=True)
+    with open(state_path, 'w') as file:
+        json.dump(sorted(files), file, indent=1)
+
+def sync_dir_files(src, dest, jobs=4, link=False, state_path=SYNC_STATE_PATH):
+    """Mirrors the files under src into dest, touching only what changed.
+
+    dest may hold other outputs (generated pages), so only files recorded
+    by a previous sync are considered stale when they leave src.
+    Returns (copied, skipped, removed) lists of paths relative to dest.
+    """
+    files = []
+    for dirpath, dirnames, filenames in os.walk(src):
+        dirnames.sort()
+        rel_dir = os.path.relpath(dirpath, src)
+        os.makedirs(os.path.join(dest, rel_dir), exist_ok=True)
+        for filename in sorted(filenames):
+            files.append(os.path.normpath(os.path.join(rel_dir, filename)))
+
+    changed = [f for f in files if not is_unchanged(os.path.join(src, f), os.path.join(dest, f))]
+    changed_set = set(changed)
+    skipped = [f for f in files if f not in changed_set]
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        list(pool.map(lambda f: fast_copy(os.path.join(src, f), os.path.join(dest, f), link), changed))
+
+    removed = []
+    for f in sorted(load_synced_files(state_path) - set(files)):
+        path = os.path.join(dest, f)
+        if os.path.isfile(path):
+            os.remove(path)
+            removed.append(f)
+            remove_empty_dirs(os.path.dirname(path))
+
+    save_synced_files(state_path, files)
+
+    return changed, skipped, removed
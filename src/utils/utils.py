@@ -1,18 +1,62 @@
-from functools import reduce
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+from functools import lru_cache, reduce
+import io
+from itertools import chain
 import os
-from pathlib import Path
 import re
 import shutil
-from block_markdown import BlockType
+from types import MappingProxyType
+from block_markdown import BlockType, block_payload, classify_block, iter_block_lines, iter_classified_blocks
+from escape import Markup, escape_text
 from htmlnode import HtmlNode
 from leafnode import LeafNode
 from parentnode import ParentNode
-from textnode import TextNode, TextType
-
-
-def text_node_to_html_node(text_node: TextNode):
+from minify import collapse_whitespace, minify_props
+from template import TemplateCache, rewrite_basepath
+from textnode import TextDelimeter, TextNode, TextType
+from utils.block_cache import BlockCache
+from utils.front_matter import MetadataCache, read_header, split_front_matter
+from utils.manifest import BuildManifest
+from utils.output import OutputWriter
+from utils.pipeline import run_pipeline
+from utils.profiling import BuildProfiler, count_nodes
+from utils.render_cache import RenderCache
+from utils.search import SearchIndex
+from utils.sync import SYNC_STATE_PATH, sync_dir_files
+from utils.walk import iter_pages
+
+template_cache = TemplateCache()
+block_cache = BlockCache()
+# Minify pages while rendering them.
+minify = False
+# Set to a BuildProfiler to time builds; None keeps the fast path untouched.
+profiler: BuildProfiler = None
+# Set to a SearchIndex to index pages while they are rendered.
+search_index: SearchIndex = None
+# Writes pages atomically and counts the ones that did not change.
+output_writer = OutputWriter()
+# Front matter by source path, used to leave drafts out without rendering them.
+metadata_cache = MetadataCache()
+# Set to a RenderCache to reuse pages rendered from identical inputs.
+render_cache: RenderCache = None
+
+
+@lru_cache(maxsize=4096)
+def link_props(url):
+    # Shared between every link to the same url, so it is read-only.
+    return MappingProxyType({'href': url})
+
+@lru_cache(maxsize=4096)
+def image_props(url):
+    return MappingProxyType({'src': url, 'alt': url})
+
+def text_node_to_html_node(text_node: TextNode, minify=False):
         if not text_node:
             raise ValueError('No text node given.')
+
+        if minify and text_node.text_type is not TextType.CODE:
+            return minified_text_node_to_html_node(text_node)
         
         match text_node.text_type:
             case TextType.TEXT:
@@ -24,12 +68,22 @@ def text_node_to_html_node(text_node: TextNode):
             case TextType.CODE:
                 return LeafNode('code', value=text_node.text)
             case TextType.LINK:
-                return LeafNode('a', value=text_node.text, props={'href': text_node.url})
+                return LeafNode('a', value=text_node.text, props=link_props(text_node.url))
             case TextType.IMAGE:
-                return HtmlNode('img', value='', props={'src': text_node.url, 'alt': text_node.url})
+                return HtmlNode('img', value='', props=image_props(text_node.url))
             case _:
                 raise ValueError('Not a known text type format.')
             
+def minified_text_node_to_html_node(text_node: TextNode):
+    text = collapse_whitespace(text_node.text) if text_node.text else text_node.text
+    match text_node.text_type:
+        case TextType.LINK if text:
+            return LeafNode(None, Markup(f"<a{minify_props(link_props(text_node.url))}>{escape_text(text)}</a>"))
+        case TextType.IMAGE:
+            return LeafNode(None, Markup(f"<img{minify_props(image_props(text_node.url))}>"))
+        case _:
+            return text_node_to_html_node(TextNode(text, text_node.text_type, text_node.url))
+
 def split_nodes_delimiter(old_nodes: list[TextNode], delimiter, text_type):
     new_nodes = []
     for old_node in old_nodes:
@@ -50,13 +104,16 @@ def split_nodes_delimiter(old_nodes: list[TextNode], delimiter, text_type):
         new_nodes.extend(split_nodes)
     return new_nodes
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
 def extract_markdown_images(text):
-    return re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
-    return re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    return LINK_PATTERN.findall(text)
 
-def split_nodes_image(old_nodes: list[TextNode]):
+def split_nodes_pattern(old_nodes: list[TextNode], pattern, text_type):
     new_nodes = []
 
     for node in old_nodes:
@@ -64,61 +121,83 @@ def split_nodes_image(old_nodes: list[TextNode]):
             new_nodes.append(node)
             continue
 
-        images = extract_markdown_images(node.text)
+        position = 0
+        for match in pattern.finditer(node.text):
+            if match.start() > position:
+                new_nodes.append(TextNode(node.text[position:match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = match.end()
 
-        if len(images) == 0:
+        if position == 0:
             new_nodes.append(node)
-            continue
-
-        img_alt, img_url = images[0]
-
-        segments = node.text.split(f"![{img_alt}]({img_url})", 1)
-        
-        split_nodes = []
-
-        if segments[0] != '':
-            split_nodes.append(TextNode(segments[0], TextType.TEXT))
-
-        split_nodes.append(TextNode(img_alt, TextType.IMAGE, img_url))
-
-        if segments[1] != '':
-            split_nodes.append(TextNode(segments[1], TextType.TEXT))
-        
-        new_nodes.extend(split_nodes_image(split_nodes))
+        elif position < len(node.text):
+            new_nodes.append(TextNode(node.text[position:], TextType.TEXT))
 
     return new_nodes
 
-def split_nodes_link(old_nodes):
-    new_nodes = []
-
-    for node in old_nodes:
-        if node.text_type is not TextType.TEXT:
-            new_nodes.append(node)
-            continue
-
-        links = extract_markdown_links(node.text)
-
-        if len(links) == 0:
-            new_nodes.append(node)
-            continue
-
-        link_text, link_url = links[0]
-
-        segments = node.text.split(f"[{link_text}]({link_url})", 1)
-        
-        split_nodes = []
-
-        if segments[0] != '':
-            split_nodes.append(TextNode(segments[0], TextType.TEXT))
-
-        split_nodes.append(TextNode(link_text, TextType.LINK, link_url))
+def split_nodes_image(old_nodes: list[TextNode]):
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
 
-        if segments[1] != '':
-            split_nodes.append(TextNode(segments[1], TextType.TEXT))
-        
-        new_nodes.extend(split_nodes_link(split_nodes))
+def split_nodes_link(old_nodes):
+    return split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
+
+INLINE_PATTERN = re.compile(
+    r"(?P<image>!\[(?P<alt>[^\[\]]*)\]\((?P<src>[^\(\)]*)\))"
+    r"|(?P<link>\[(?P<text>[^\[\]]*)\]\((?P<href>[^\(\)]*)\))"
+    r"|(?P<delimiter>\*\*|`|_)"
+)
+
+DELIMITER_TYPES = {
+    TextDelimeter.BOLD.value: TextType.BOLD,
+    TextDelimeter.CODE.value: TextType.CODE,
+    TextDelimeter.ITALIC.value: TextType.ITALIC,
+}
+
+def tokenize_inline(text):
+    """Splits text into TextNodes in one left-to-right scan.
+
+    The leftmost image, link or delimiter wins; the content between a
+    delimiter and its closing pair is taken literally.
+
+    This differs from splitting bold, code and italic delimiters before
+    images and links in two cases, where the old split broke the markup:
+    - Delimiters inside link or image text or URLs are kept literally.
+      "[**x**](/u)" is one link with text "**x**", where the split gave
+      "[", bold "x" and "](/u)"; "[a](/x_y_z)" links to /x_y_z instead of
+      italicizing "y", and "![a_b_c](/i.png)" keeps "a_b_c" as alt text.
+    - A delimiter inside a span opened by another one is literal, so
+      "`a**b**`" is code and "_a `b` c_" italic, where the split raised.
+    """
+    nodes = []
+    position = 0
+
+    while True:
+        match = INLINE_PATTERN.search(text, position)
+        if match is None:
+            break
+
+        if match.start() > position:
+            nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+
+        delimiter = match.group('delimiter')
+        if delimiter:
+            close = text.find(delimiter, match.end())
+            if close == -1:
+                raise ValueError("invalid markdown, formatted section not closed")
+            if close > match.end():
+                nodes.append(TextNode(text[match.end():close], DELIMITER_TYPES[delimiter]))
+            position = close + len(delimiter)
+        elif match.group('image'):
+            nodes.append(TextNode(match.group('alt'), TextType.IMAGE, match.group('src')))
+            position = match.end()
+        else:
+            nodes.append(TextNode(match.group('text'), TextType.LINK, match.group('href')))
+            position = match.end()
+
+    if position < len(text):
+        nodes.append(TextNode(text[position:], TextType.TEXT))
 
-    return new_nodes
+    return nodes
 
 def text_to_textnodes(text):
     nodes = []
@@ -127,16 +206,8 @@ def text_to_textnodes(text):
     
     if not isinstance(text, str):
         raise ValueError('text is not a string')
-    
-    text_node = TextNode(text,TextType.TEXT)
-    
-    nodes = split_nodes_delimiter([text_node], '**', TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, '`', TextType.CODE)
-    nodes = split_nodes_delimiter(nodes, '_', TextType.ITALIC)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
 
-    return nodes
+    return tokenize_inline(text)
 
 def markdown_to_blocks(markdown: str):
     if not markdown:
@@ -151,32 +222,8 @@ def markdown_to_blocks(markdown: str):
 
     return list(blocks)
 
-def check_every_line_start_with(lines: list[str], pattern):
-    for line in lines:
-        if not line.startswith(pattern):
-            return False
-    return True
-
-def check_ordered_list_block(lines: list[str]):
-    for n in range(len(lines)):
-        if not lines[n].startswith(f'{n+1}. '):
-            return False
-    return True
-
 def block_to_block_type(block: str):
-
-    if re.match(r"^#{1,6} ", block):
-        return BlockType.HEADING
-    if block.startswith("```") and block.endswith("```"):
-        return BlockType.CODE
-    if check_every_line_start_with(block.split('\n'), '>'):
-        return BlockType.QUOTE
-    if check_every_line_start_with(block.split('\n'), '- '):
-        return BlockType.UNORDERED_LIST
-    if check_ordered_list_block(block.split('\n')):
-        return BlockType.ORDERED_LIST
-    
-    return BlockType.PARAGRAPH
+    return classify_block(block.split('\n'))[0]
 
 def handle_block_by_type(block):
     return block_to_node(block, block_to_block_type(block))
@@ -198,64 +245,111 @@ def get_paragraph_html(text):
 
     return ParentNode('div', children=html_nodes)
 
-def handle_children_text(text):
-    text_nodes = text_to_textnodes(text)
-    html_nodes = list(map(text_node_to_html_node, text_nodes))
+def handle_children_text(text, minify=False):
+    if profiler is None:
+        text_nodes = text_to_textnodes(text)
+    else:
+        with profiler.stage('inline'):
+            text_nodes = text_to_textnodes(text)
+    if search_index is not None:
+        search_index.collect(text_nodes)
+    html_nodes = [text_node_to_html_node(text_node, minify) for text_node in text_nodes]
 
     return html_nodes
 
-def handle_list_children(items):
+def handle_list_children(items, minify=False):
     children = []
     for item in items:
-        nodes = handle_children_text(item.strip(' '))
+        nodes = handle_children_text(item.strip(' '), minify)
         children.append(ParentNode('li', nodes))
 
     return children
 
 def block_to_node(block: str, block_type: BlockType):
+    return payload_to_node(block_type, block_payload(block_type, block.split('\n')))
+
+def payload_to_node(block_type: BlockType, payload, minify=False):
+    """Builds the node for a classified block. Every block is wrapped in a
+    div; when minifying, only paragraphs keep it since the other blocks
+    already render as block elements."""
     nodes = []
     match(block_type):
         case BlockType.PARAGRAPH:
-            nodes =  handle_children_text(block)
+            nodes =  handle_children_text(payload, minify)
         case BlockType.HEADING:
-            nodes = [heading_type_block_to_html_node(block)]
+            prefix, text = payload
+            nodes = [LeafNode(get_heading_tag(prefix), text)]
+            if search_index is not None:
+                search_index.collect([TextNode(text, TextType.TEXT)])
         case BlockType.CODE:
-            nodes = [LeafNode('code', block.strip('`'))]
+            nodes = [LeafNode('code', payload)]
         case BlockType.QUOTE:
-            text = re.sub(r"^>", '', block, flags=re.MULTILINE)
-            children = handle_children_text(text.strip(' '))
+            children = handle_children_text(payload, minify)
             nodes = [ParentNode('blockquote', children)]
         case BlockType.UNORDERED_LIST:
-            stripped_block = re.sub(r"^- ", '', block, flags=re.MULTILINE)
-            # handle_children_text(stripped_block)
-            children = handle_list_children(stripped_block.split('\n'))
+            children = handle_list_children(payload, minify)
             nodes = [ParentNode('ul', children)]
         case BlockType.ORDERED_LIST:
-            stripped_block = re.sub(r"^\d\. ", '', block, flags=re.MULTILINE)
-            children = handle_list_children(stripped_block.split('\n'))
+            children = handle_list_children(payload, minify)
             nodes = [ParentNode('ol', children)]
         case _:
             raise Exception('Unknown type')
+
+    if minify and block_type is not BlockType.PARAGRAPH:
+        return nodes[0]
         
     return ParentNode('div', nodes)
     
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-
-    nodes = map(handle_block_by_type, blocks)
-
-    return ParentNode('div',list(nodes))
-
-def publish_static_files():
+    blocks = iter_classified_blocks(markdown.split('\n'))
+
+    nodes = [payload_to_node(block_type, payload) for block_type, _, payload in blocks]
+
+    return ParentNode('div',nodes)
+
+def block_lines_to_node(block_lines, minify=False):
+    node = payload_to_node(*classify_block(block_lines), minify)
+    if profiler is not None and profiler.current is not None:
+        profiler.current.nodes += count_nodes(node)
+    return node
+
+def markdown_to_html_chunks(lines, cache: BlockCache = None, minify=False):
+    """Streams the html of markdown_to_html_node one block at a time.
+
+    Blocks found in the cache are not classified or rendered again. With
+    minify, whitespace in text is collapsed (code is kept as is), block
+    wrappers are dropped and attributes are left unquoted where safe.
+    """
+    return blocks_to_html_chunks(iter_block_lines(lines), cache, minify)
+
+def blocks_to_html_chunks(blocks, cache: BlockCache = None, minify=False):
+    """markdown_to_html_chunks for blocks already split into lines."""
+    variant = 'minify:' if minify else ''
+    yield '<div>'
+    rendered = False
+    for block_lines in blocks:
+        if cache is None:
+            yield from block_lines_to_node(block_lines, minify).iter_html()
+        else:
+            yield cache.render('\n'.join(block_lines), lambda _: block_lines_to_node(block_lines, minify).to_html(), variant)
+        rendered = True
+    if not rendered:
+        raise ValueError('No children specified.')
+    yield '</div>'
+
+def publish_static_files(static_folder='static', public_folder='docs', sync=False, jobs=4, state_path=SYNC_STATE_PATH):
     print('\nCopying static files\n')
-    static_folder = 'static'
-    public_folder = 'docs'
 
     try:
+        if sync:
+            copied, skipped, removed = sync_dir_files(static_folder, public_folder, jobs, state_path=state_path)
+            print(f"Copied {len(copied)} static files, {len(skipped)} unchanged, {len(removed)} removed")
+            return
+
         if os.path.exists(public_folder):
             shutil.rmtree(public_folder)
        
-        os.mkdir(public_folder)
+        os.makedirs(public_folder, exist_ok=True)
 
         copy_dir_files(static_folder, public_folder)
 
@@ -274,7 +368,7 @@ def copy_dir_files(src, dest):
             shutil.copy(f_path, dest)
         elif os.path.isdir(f_path):
             dest_dir = os.path.join(dest,f)
-            os.mkdir(dest_dir)
+            os.makedirs(dest_dir, exist_ok=True)
             copy_dir_files(f_path, dest_dir)
     
     return
@@ -287,61 +381,277 @@ def extract_title(markdown):
     
     return title_matches[0].strip()
 
+def page_title(meta):
+    if not meta.title:
+        raise Exception("No title specified!")
+    return meta.title
+
 def generate_page(from_path, template_path, dest_path, basepath= "/"):
     print(f"Generating page from {from_path} to {dest_path} using {template_path}\n\n")
-    markdown = ''
-    template = ''
-
-    with open(from_path, 'r') as file:
-        markdown = file.read()
-
-    with open(template_path, 'r') as file:
-        template = file.read()
-
-    title = extract_title(markdown)
 
-    template = template.replace(r"{{ Title }}", title)
+    if profiler is not None or page_render_cache() is not None:
+        return generate_page_in_memory(from_path, template_path, dest_path, basepath)
 
-    content = markdown_to_html_node(markdown).to_html()
-
-    template = template.replace(r"{{ Content }}", content)
-
-    template = template.replace(r'href="/', f'href="{basepath}')
-    template = template.replace(r'src="/', f'src="{basepath}')
+    template = template_cache.get(template_path, basepath, minify)
 
     if not os.path.exists(dest_path):
         dirs = os.path.dirname(dest_path)
         os.makedirs(dirs, exist_ok=True)
 
-    f = open(dest_path, "w")
-    f.write(template)
-    f.close()       
+    if search_index is not None:
+        search_index.begin_page()
+
+    with open(from_path, 'r') as file:
+        meta, first_line = read_header(file)
+        title = page_title(meta)
+        content = markdown_to_html_chunks(chain([first_line], file), page_block_cache(), minify)
+
+        with output_writer.open(dest_path) as f:
+            template.write(f, Title=escape_text(title), Content=(rewrite_basepath(chunk, basepath) for chunk in content))
+
+    if search_index is not None:
+        search_index.end_page(dest_path, title)
         
     return
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath = "/"):
-    files = os.listdir(dir_path_content)
+def page_block_cache():
+    # Cached blocks skip inline parsing, which is what feeds the search index.
+    return block_cache if search_index is None else None
+
+def page_render_cache():
+    # Like cached blocks, cached pages would not reach the search index.
+    return render_cache if search_index is None else None
+
+def page_stage(name):
+    """Times name into the page the profiler is timing, if any."""
+    if profiler is None or profiler.current is None:
+        return nullcontext()
+    return profiler.stage(name)
+
+def generate_page_in_memory(from_path, template_path, dest_path, basepath= "/"):
+    """generate_page for pages rendered as a whole rather than streamed:
+    through the render cache, or with the profiler timing each stage."""
+    with profiler.page(from_path, dest_path) if profiler is not None else nullcontext() as record:
+        with page_stage('read'):
+            with open(from_path, 'r') as file:
+                markdown = file.read()
+                bytes_read = os.fstat(file.fileno()).st_size
+
+        data = render_source(markdown, template_path, dest_path, basepath)
+
+        with page_stage('write'):
+            if type(data) is str:
+                data = data.encode()
+            dirs = os.path.dirname(dest_path)
+            if dirs:
+                os.makedirs(dirs, exist_ok=True)
+            output_writer.write(dest_path, data)
+
+        if record is not None:
+            record.bytes_read, record.bytes_written = bytes_read, len(data)
+
+def render_source(markdown, template_path, dest_path, basepath= "/"):
+    """Renders the markdown of the page at dest_path to html (or cached
+    bytes), the way every path that renders whole pages does: through the
+    render cache when there is one, feeding the search index otherwise."""
+    with page_stage('template'):
+        template = template_cache.get(template_path, basepath, minify)
+
+    cache = page_render_cache()
+    if cache is not None:
+        key = cache.key(markdown, template_path, basepath, minify)
+        return cache.render(key, lambda: render_page(markdown, template, basepath))
+    if search_index is None:
+        return render_page(markdown, template, basepath)
+    search_index.begin_page()
+    html = render_page(markdown, template, basepath)
+    search_index.end_page(dest_path, page_title(split_front_matter(markdown)[0]))
+    return html
+
+def render_page(markdown, template, basepath= "/"):
+    """Renders a page held in memory. While the profiler times a page,
+    splitting blocks and rendering them are timed as stages."""
+    meta, markdown = split_front_matter(markdown)
+    title = page_title(meta)
+    with page_stage('blocks'):
+        blocks = list(iter_block_lines(markdown.split('\n')))
+
+    with page_stage('render'):
+        content = blocks_to_html_chunks(blocks, page_block_cache(), minify)
+        return template.render(Title=escape_text(title), Content=''.join(rewrite_basepath(chunk, basepath) for chunk in content))
+
+def collect_pages(dir_path_content, dest_dir_path, include=(), exclude=()):
+    return list(iter_pages(dir_path_content, dest_dir_path, include, exclude))
+
+def _worker_settings():
+    """The build settings held in this module, as plain values that can
+    be sent to pool workers."""
+    return (
+        minify,
+        block_cache.maxsize,
+        list(block_cache.entries.items()),
+        profiler is not None,
+        (search_index.dest_dir, search_index.basepath) if search_index is not None else None,
+        (render_cache.directory, render_cache.max_size) if render_cache is not None else None,
+    )
+
+def _init_worker(settings):
+    """Sets up a pool worker from _worker_settings(). Workers started with
+    spawn or forkserver do not inherit this module's globals, so without
+    this they would render with the defaults."""
+    global template_cache, block_cache, minify, profiler, search_index, output_writer, metadata_cache, render_cache
+    minify, block_cache_size, blocks, profiling, search, render = settings
+    template_cache = TemplateCache()
+    block_cache = BlockCache(block_cache_size)
+    for key, html in blocks:
+        block_cache.add(key, html)
+    profiler = BuildProfiler() if profiling else None
+    search_index = SearchIndex(*search) if search is not None else None
+    output_writer = OutputWriter()
+    metadata_cache = MetadataCache()
+    render_cache = RenderCache(*render) if render is not None else None
+
+def _generate_page_job(job):
+    from_path, template_path, dest_path, basepath = job
+    log = io.StringIO()
+    error = None
+
+    if profiler is not None:
+        # Records are handed back to the parent, which runs the hooks.
+        profiler.hooks = []
+        profiler.pages = []
+    if search_index is not None:
+        search_index.updated = []
+    written, skipped = output_writer.written, output_writer.skipped
+    hits, misses = (render_cache.hits, render_cache.misses) if render_cache is not None else (0, 0)
+    # New blocks and counts are handed back to the parent's cache.
+    block_cache.added = []
+    block_hits, block_misses = block_cache.hits, block_cache.misses
 
-    if len(files) == 0:
-        raise Exception('No content.')
     try:
-        if not os.path.exists(dest_dir_path):
-            os.mkdir(dest_dir_path)
-        
-        for f in files:
-            f_path = os.path.join(dir_path_content, f)
+        with redirect_stdout(log):
+            generate_page(from_path, template_path, dest_path, basepath)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    records = profiler.pages if profiler is not None else []
+    search_entries = search_index.updated if search_index is not None else []
+    counts = (output_writer.written - written, output_writer.skipped - skipped)
+    if render_cache is not None:
+        counts += (render_cache.hits - hits, render_cache.misses - misses)
+    blocks = (block_cache.hits - block_hits, block_cache.misses - block_misses, block_cache.added)
+    return log.getvalue(), error, records, search_entries, counts, blocks
+
+def generate_pages(pages, template_path, basepath = "/", jobs = 1, pipeline = False):
+    """Renders (from_path, dest_path) pairs and returns the pages that failed.
+
+    With more than one job the pages are rendered on a process pool. Logs
+    are printed in page order and every failure is reported, so one bad
+    file does not hide the others. With pipeline set (and a single job,
+    without the profiler), reading and writing overlap rendering on
+    background threads. Every path renders whole pages via render_source
+    or streams them through generate_page.
+    """
+    if pipeline and (jobs > 1 or profiler is not None):
+        # Reading and writing on other threads cannot be timed per page,
+        # and pool workers already overlap them.
+        print("Warning: pipeline ignored with several jobs or profiling")
+    elif pipeline:
+        def render(from_path, dest_path, markdown):
+            print(f"Generating page from {from_path} to {dest_path} using {template_path}\n\n")
+            return render_source(markdown, template_path, dest_path, basepath)
+
+        if search_index is not None:
+            for _, dest_path in pages:
+                search_index.reserve(dest_path)
+        return run_pipeline(pages, render, writer=output_writer)
+
+    if jobs <= 1 or len(pages) <= 1:
+        for from_path, dest_path in pages:
+            generate_page(from_path, template_path, dest_path, basepath)
+        return []
 
-            if os.path.isfile(f_path):
-                dest_filename = Path(f_path).stem + '.html'
-                dest_dir = os.path.join(dest_dir_path,dest_filename)
-                generate_page(f_path,template_path,dest_dir, basepath)
+    page_jobs = [(from_path, template_path, dest_path, basepath) for from_path, dest_path in pages]
+    chunksize = max(1, len(page_jobs) // (jobs * 4))
+    errors = []
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(_worker_settings(),)) as pool:
+        results = pool.map(_generate_page_job, page_jobs, chunksize=chunksize)
+        for (from_path, dest_path), (log, error, records, search_entries, counts, blocks) in zip(pages, results):
+            print(log, end='')
+            output_writer.count(*counts[:2])
+            if render_cache is not None:
+                render_cache.count(*counts[2:])
+            block_hits, block_misses, added = blocks
+            block_cache.hits += block_hits
+            block_cache.misses += block_misses
+            for key, html in added:
+                block_cache.add(key, html)
+            for record in records:
+                profiler.add(record)
+            for indexed_path, entry in search_entries:
+                search_index.set_page(indexed_path, entry)
+            if error is not None:
+                errors.append((from_path, error))
+
+    return errors
+
+def without_drafts(pages, unreadable):
+    """Leaves out (from_path, dest_path) pages marked draft. Pages whose
+    front matter cannot be read are added to unreadable as (from_path,
+    dest_path, error) and left out, so one bad page does not stop the
+    walk."""
+    for from_path, dest_path in pages:
+        try:
+            draft = metadata_cache.get(from_path).draft
+        except (OSError, ValueError) as e:
+            unreadable.append((from_path, dest_path, f"{type(e).__name__}: {e}"))
+            continue
+        if not draft:
+            yield from_path, dest_path
 
-            elif os.path.isdir(f_path):
-                dest_dir = os.path.join(dest_dir_path,f)
-                generate_pages_recursive(f_path, template_path, dest_dir, basepath)
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath = "/", manifest: BuildManifest = None, jobs = 1, pipeline = False, include = (), exclude = (), drafts = True):
+    errors = []
+    try:
+        # A plain serial build renders pages as the walk finds them.
+        pages = iter_pages(dir_path_content, dest_dir_path, include, exclude)
+        unreadable = []
+        if not drafts:
+            pages = without_drafts(pages, unreadable)
+        if manifest is None and (jobs > 1 or pipeline):
+            pages = list(pages)
+        os.makedirs(dest_dir_path, exist_ok=True)
+
+        fingerprints = {}
+        if manifest is not None:
+            stale_pages = []
+            for from_path, dest_path in pages:
+                fingerprint = manifest.fingerprint(from_path, template_path, basepath, minify)
+                # A page missing from the search index is rendered again to index it.
+                if manifest.is_fresh(dest_path, fingerprint) and (search_index is None or search_index.has_page(dest_path)):
+                    manifest.record(dest_path, fingerprint, rendered=False)
+                    continue
+                fingerprints[dest_path] = fingerprint
+                stale_pages.append((from_path, dest_path))
+            pages = stale_pages
+
+        # A lazy walk fills unreadable while the pages are generated.
+        rendered_errors = generate_pages(pages, template_path, basepath, jobs, pipeline)
+        errors = [(from_path, error) for from_path, _, error in unreadable] + rendered_errors
+
+        if manifest is not None:
+            failed = {from_path for from_path, _ in errors}
+            for from_path, dest_path in pages:
+                if from_path in failed:
+                    manifest.keep(dest_path)
+                else:
+                    manifest.record(dest_path, fingerprints[dest_path])
+            for _, dest_path, _ in unreadable:
+                manifest.keep(dest_path)
+            # Pages not seen by now were left out as drafts or excluded.
+            manifest.complete = True
 
     except OSError as e:
         print(f"Failed - error: {e}")
 
-    return
-    
+    return errors
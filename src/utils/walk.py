@@ -0,0 +1,47 @@
+from fnmatch import fnmatchcase
+import os
+
+MARKDOWN_SUFFIX = '.md'
+
+
+def matches_any(rel_path, patterns):
+    return any(fnmatchcase(rel_path, pattern) for pattern in patterns)
+
+def sorted_entries(path):
+    with os.scandir(path) as entries:
+        return sorted(entries, key=lambda entry: entry.name)
+
+def is_page(rel_path, include=(), exclude=()):
+    """Whether a file, given by its '/' separated path relative to the
+    content directory, is a page to render."""
+    if not rel_path.endswith(MARKDOWN_SUFFIX):
+        return False
+    if include and not matches_any(rel_path, include):
+        return False
+    return not (exclude and matches_any(rel_path, exclude))
+
+def iter_pages(content_dir, dest_dir, include=(), exclude=()):
+    """Yields (from_path, dest_path) for every page under content_dir.
+
+    Entries are visited depth first in name order, so the order does not
+    depend on the filesystem. The walk uses an explicit stack of directory
+    iterators and the file types cached on each DirEntry, so it needs no
+    extra stat calls and only holds the entries of the directories on the
+    current path. Directories matching an exclude glob are not entered.
+    Empty directories and files that are not Markdown are skipped.
+    """
+    stack = [(dest_dir, '', iter(sorted_entries(content_dir)))]
+    while stack:
+        dest, rel_dir, entries = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        rel_path = rel_dir + entry.name
+        if entry.is_dir():
+            if exclude and matches_any(rel_path, exclude):
+                continue
+            stack.append((os.path.join(dest, entry.name), rel_path + '/', iter(sorted_entries(entry.path))))
+        elif entry.is_file() and is_page(rel_path, include, exclude):
+            yield entry.path, os.path.join(dest, entry.name[:-len(MARKDOWN_SUFFIX)] + '.html')
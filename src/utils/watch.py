@@ -0,0 +1,136 @@
+import os
+from pathlib import Path
+import time
+
+from utils import utils
+from utils.manifest import remove_empty_dirs
+from utils.sync import fast_copy
+from utils.utils import collect_pages, generate_page
+from utils.walk import is_page
+
+
+def snapshot(path):
+    """Maps every file under path (or path itself) to its (mtime, size)."""
+    files = {}
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    stack = [path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def diff_snapshots(old, new):
+    changed = [path for path, signature in new.items() if old.get(path) != signature]
+    removed = [path for path in old if path not in new]
+    return sorted(changed), sorted(removed)
+
+def page_dest_path(from_path, content_dir, dest_dir):
+    rel_dir = os.path.relpath(os.path.dirname(from_path), content_dir)
+    return os.path.normpath(os.path.join(dest_dir, rel_dir, Path(from_path).stem + '.html'))
+
+def remove_output(path):
+    if os.path.isfile(path):
+        os.remove(path)
+        remove_empty_dirs(os.path.dirname(path))
+
+
+class Watcher():
+    """Polls content, static files and the template and rebuilds only the
+    outputs a change affects. Template and block caches stay warm between
+    rebuilds because the process keeps running. Unless drafts is set,
+    pages marked draft are not rendered and their outputs are removed."""
+
+    def __init__(self, content_dir, template_path, static_dir, dest_dir, basepath='/', interval=0.05,
+                 include=(), exclude=(), drafts=True):
+        self.content_dir = content_dir
+        self.template_path = template_path
+        self.static_dir = static_dir
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.interval = interval
+        self.include = include
+        self.exclude = exclude
+        self.drafts = drafts
+        self.snapshots = self.take_snapshots()
+
+    def take_snapshots(self):
+        return {
+            'content': snapshot(self.content_dir),
+            'static': snapshot(self.static_dir),
+            'template': snapshot(self.template_path),
+        }
+
+    def poll(self):
+        """Rebuilds whatever changed since the last poll and returns the
+        list of outputs that were written or removed."""
+        new = self.take_snapshots()
+        old, self.snapshots = self.snapshots, new
+        outputs = []
+
+        template_changed, _ = diff_snapshots(old['template'], new['template'])
+        if template_changed:
+            for from_path, dest_path in collect_pages(self.content_dir, self.dest_dir, self.include, self.exclude):
+                outputs.append(self.render(from_path, dest_path))
+        else:
+            changed, removed = diff_snapshots(old['content'], new['content'])
+            changed = [path for path in changed if self.is_page(path)]
+            removed = [path for path in removed if self.is_page(path)]
+            for from_path in changed:
+                outputs.append(self.render(from_path, page_dest_path(from_path, self.content_dir, self.dest_dir)))
+            for from_path in removed:
+                dest_path = page_dest_path(from_path, self.content_dir, self.dest_dir)
+                remove_output(dest_path)
+                outputs.append(dest_path)
+
+        changed, removed = diff_snapshots(old['static'], new['static'])
+        for src in changed:
+            dest = os.path.join(self.dest_dir, os.path.relpath(src, self.static_dir))
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            fast_copy(src, dest)
+            outputs.append(dest)
+        for src in removed:
+            dest = os.path.join(self.dest_dir, os.path.relpath(src, self.static_dir))
+            remove_output(dest)
+            outputs.append(dest)
+
+        return outputs
+
+    def is_page(self, from_path):
+        rel_path = os.path.relpath(from_path, self.content_dir).replace(os.sep, '/')
+        return is_page(rel_path, self.include, self.exclude)
+
+    def render(self, from_path, dest_path):
+        try:
+            if not self.drafts and utils.metadata_cache.get(from_path).draft:
+                remove_output(dest_path)
+            else:
+                generate_page(from_path, self.template_path, dest_path, self.basepath)
+        except Exception as e:
+            print(f"Failed to generate {from_path} - error: {e}")
+        return dest_path
+
+    def run(self):
+        print(f"Watching {self.content_dir}, {self.static_dir} and {self.template_path} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(self.interval)
+                started = time.perf_counter()
+                outputs = self.poll()
+                if outputs:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    print(f"Rebuilt {len(outputs)} outputs in {elapsed:.1f} ms")
+        except KeyboardInterrupt:
+            pass